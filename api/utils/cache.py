@@ -0,0 +1,189 @@
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Cache em memória (por processo) com expiração (TTL) e descarte LRU.
+
+    - maxsize: número máximo de entradas
+    - ttl: tempo de vida de cada entrada em segundos
+    Thread-safe: dependências síncronas do FastAPI rodam no threadpool.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class ResponseCache:
+    """
+    Cache de respostas serializadas (bytes + headers) com descarte LRU por orçamento de bytes.
+
+    - max_bytes: soma máxima dos corpos em memória
+    - ttl: tempo de vida de cada entrada (rede de segurança para escritas de outros processos)
+    - generation: contador incrementado a cada escrita; entradas de gerações antigas são descartadas
+    Guarda também acertos/falhas por chave (limitado a key_stats_size chaves).
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, ttl: float = 30.0, key_stats_size: int = 1024):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.key_stats_size = key_stats_size
+        self.generation = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._key_stats: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.rejected = 0
+
+    def _count(self, key: Hashable, hit: bool) -> None:
+        counters = self._key_stats.get(key)
+        if counters is None:
+            counters = self._key_stats[key] = [0, 0]
+            while len(self._key_stats) > self.key_stats_size:
+                self._key_stats.popitem(last=False)
+        self._key_stats.move_to_end(key)
+        counters[0 if hit else 1] += 1
+
+    def _drop(self, key: Hashable) -> None:
+        body = self._data.pop(key)[0]
+        self._bytes -= len(body)
+
+    def get(self, key: Hashable) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                body, headers, generation, expires_at = item
+                if generation == self.generation and expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    self._count(key, hit=True)
+                    return body, headers
+                self._drop(key)
+                self.invalidations += 1
+
+            self.misses += 1
+            self._count(key, hit=False)
+            return None
+
+    def set(self, key: Hashable, body: bytes, headers: Dict[str, str], generation: int) -> None:
+        """generation: valor lido ANTES da consulta; se houve escrita no meio, a entrada não é guardada"""
+        with self._lock:
+            if generation != self.generation or len(body) > self.max_bytes:
+                self.rejected += 1
+                return
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (body, headers, generation, time.monotonic() + self.ttl)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def bump(self) -> None:
+        """Nova geração: tudo o que está em cache deixa de valer (descartado na próxima leitura)"""
+        with self._lock:
+            self.generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            hottest = sorted(self._key_stats.items(), key=lambda item: item[1][0], reverse=True)[:top]
+            return {
+                "size": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "generation": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "rejected": self.rejected,
+                "top_keys": [
+                    {
+                        "key": repr(key),
+                        "hits": hits,
+                        "misses": misses,
+                        "hit_ratio": hits / (hits + misses),
+                    }
+                    for key, (hits, misses) in hottest
+                ],
+            }
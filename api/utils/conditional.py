@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import hashlib
+from typing import Any, Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response
+
+
+def _digest(parts: Iterable[Any]) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        hasher.update(str(part).encode("utf-8"))
+        hasher.update(b"\x1f")
+    return hasher.hexdigest()
+
+
+def strong_etag(id: Any, updated_at: datetime, fields: Optional[List[str]] = None) -> str:
+    """
+    ETag forte de um registro: id + updated_at (muda a cada escrita).
+    fields entra no hash porque cada projeção é uma representação diferente.
+    """
+    return f'"{_digest([id, updated_at.isoformat(), *(fields or [])])}"'
+
+
+def weak_etag(versions: Iterable[Tuple[Any, datetime]], fields: Optional[List[str]] = None) -> str:
+    """ETag fraco de uma página: sequência de (id, updated_at) dos itens, na ordem retornada"""
+    parts = [part for id, updated_at in versions for part in (id, updated_at.isoformat())]
+    return f'W/"{_digest([*(fields or []), "|", *parts])}"'
+
+
+def http_date(value: datetime) -> str:
+    # Last-Modified em GMT com precisão de segundos (formato IMF-fixdate)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match usa comparação fraca: ignora o prefixo W/
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Avalia If-None-Match e, só na ausência dele, If-Modified-Since (RFC 9110).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None) -> Response:
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    # 304 sem corpo, repetindo os validadores
+    return set_validators(Response(status_code=304), etag, last_modified)
@@ -0,0 +1,60 @@
+from enum import Enum
+import json
+from typing import Any, Hashable, List, Optional, Tuple
+
+from decouple import config
+from sqlalchemy import text
+
+from api.utils.cache import TTLCache
+from api.utils.db_filter import FilterCondition
+
+# Contagens exatas por combinação de filtros ficam em cache por pouco tempo,
+# para que a navegação entre páginas não refaça o COUNT(*) a cada requisição.
+COUNT_CACHE_SIZE = config("COUNT_CACHE_SIZE", default=1024, cast=int)
+COUNT_CACHE_TTL = config("COUNT_CACHE_TTL", default=10, cast=float)
+count_cache = TTLCache(maxsize=COUNT_CACHE_SIZE, ttl=COUNT_CACHE_TTL)
+
+RELTUPLES_SQL = text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)")
+
+
+class CountMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+
+
+def count_cache_key(
+    table_name: str,
+    search: Optional[str] = None,
+    filter_conditions: Optional[List[FilterCondition]] = None
+) -> Hashable:
+    """
+    Chave normalizada: condições ordenadas, valores exatos.
+    Nada passa por lower()/strip() no Python: a comparação case-insensitive é do PostgreSQL
+    (lower/ILIKE), que difere do Python em textos não ASCII, e espaços fazem parte do ILIKE.
+    """
+    conditions = tuple(sorted(
+        (condition.campo, condition.operador.value, condition.valor)
+        for condition in filter_conditions or []
+    ))
+    return (table_name, search or None, conditions)
+
+
+def explain_statement(statement: Any, dialect: Any) -> Tuple[str, Any]:
+    """
+    Monta "EXPLAIN (FORMAT JSON) <statement>" com os parâmetros no formato do driver
+    (dict para psycopg2, tupla posicional para asyncpg), sem renderizar valores no SQL.
+    """
+    compiled = statement.compile(dialect=dialect)
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    return f"EXPLAIN (FORMAT JSON) {compiled.string}", params
+
+
+def plan_rows(explain_result: Any) -> int:
+    """Estimativa de linhas do planner a partir do resultado do EXPLAIN (FORMAT JSON)"""
+    # psycopg2 já devolve o JSON decodificado; asyncpg devolve texto
+    plan = explain_result
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -3,10 +3,15 @@ import re
 from typing import Any, Dict, List, Optional, Type
 
 from pydantic import BaseModel, field_validator
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, or_
 
 from api.utils.exceptions import exception_400_BAD_REQUEST
 
+# Índices trigram só ajudam com termos de pelo menos 3 caracteres;
+# termos menores forçariam seq scan na tabela inteira.
+SEARCH_MIN_LENGTH = 3
+LIKE_ESCAPE_CHAR = "/"
+
 
 class FilterOperator(str, Enum):
     EQ = "eq"
@@ -39,16 +44,74 @@ def validate_sort_field(
         )
 
 
+def parse_fields(
+    fields: Optional[str],
+    allowed_fields: List[str]
+) -> Optional[List[str]]:
+    """
+    Converte o parâmetro fields (ex: "id,name") em lista validada contra allowed_fields.
+    Retorna None quando não informado (resposta completa).
+    """
+    if not fields:
+        return None
+
+    selected = []
+    for field in fields.split(","):
+        field = field.strip()
+        if not field:
+            continue
+        if field not in allowed_fields:
+            valid_fields = ", ".join(allowed_fields)
+            raise exception_400_BAD_REQUEST(
+                detail=f"Campo '{field}' não é válido em fields. Campos válidos: {valid_fields}"
+            )
+        if field not in selected:
+            selected.append(field)
+
+    return selected or None
+
+
+def escape_like(value: str) -> str:
+    """ Escapa %, _ e o próprio caractere de escape para que sejam tratados como literais no LIKE """
+    return (
+        value.replace(LIKE_ESCAPE_CHAR, LIKE_ESCAPE_CHAR * 2)
+        .replace("%", LIKE_ESCAPE_CHAR + "%")
+        .replace("_", LIKE_ESCAPE_CHAR + "_")
+    )
+
+
+def contains_filter(column: Any, value: str):
+    """ ILIKE '%valor%' com metacaracteres escapados (servido pelos índices trigram) """
+    return column.ilike(f"%{escape_like(value)}%", escape=LIKE_ESCAPE_CHAR)
+
+
+def iequals_filter(column: Any, value: str):
+    """
+    Igualdade case-insensitive servida pelos índices funcionais lower(coluna).
+    O lower() do valor também roda no PostgreSQL: o do Python difere em textos não ASCII.
+    """
+    return func.lower(column) == func.lower(value)
+
+
+def validate_search_term(search: str, campo: str = "search") -> None:
+    """ Garante o tamanho mínimo para buscas por substring (servidas pelos índices trigram) """
+    if len(search.strip()) < SEARCH_MIN_LENGTH:
+        raise exception_400_BAD_REQUEST(
+            detail=f"'{campo}' precisa ter pelo menos {SEARCH_MIN_LENGTH} caracteres"
+        )
+
+
 def build_search_filter(
     search: str, 
     model: Type[Any], 
     filter_fields: List[str]
 ):
     """ Pesquisa em todos os campos do modelo """
+    validate_search_term(search)
     filters = []
     for field in filter_fields:
         column = getattr(model, field)
-        filters.append(column.ilike(f"%{search}%"))
+        filters.append(contains_filter(column, search))
     return or_(*filters)
 
 
@@ -137,11 +200,12 @@ def build_query_filter(
         
         # Aplicar operador (todos são case-insensitive)
         if condition.operador == FilterOperator.CONTAINS.value:
-            filters.append(column.ilike(f"%{condition.valor}%"))
+            validate_search_term(condition.valor, f"{condition.campo}[contains]")
+            filters.append(contains_filter(column, condition.valor))
         elif condition.operador == FilterOperator.EQ.value:
-            filters.append(column.ilike(condition.valor))
+            filters.append(iequals_filter(column, condition.valor))
         elif condition.operador == FilterOperator.NE.value:
-            filters.append(~column.ilike(condition.valor))
+            filters.append(~iequals_filter(column, condition.valor))
     
     return and_(*filters) if filters else None
 
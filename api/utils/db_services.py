@@ -1,12 +1,57 @@
+import time
+
 from decouple import config
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from api.utils.metrics import registry
+from api.utils.sql_timing import SQL_TIMING_ENABLED, instrument
 
 DATABASE_URL = config("DATABASE_URL")
 
+# DB_ASYNC=True troca os controllers para o caminho assíncrono (AsyncSession + asyncpg).
+# Mantenho os dois caminhos para comparar throughput sob carga concorrente.
+DB_ASYNC = config("DB_ASYNC", default=False, cast=bool)
+ASYNC_DATABASE_URL = config(
+    "ASYNC_DATABASE_URL",
+    default=DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+)
+
+pool_wait_histogram = {
+    kind: registry.histogram(
+        "db_pool_wait_seconds", "Tempo para obter uma conexão do pool", labels={"engine": kind}
+    )
+    for kind in ("sync", "async")
+}
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool que mede a espera por conexão (inclui abrir uma nova quando há folga)"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait_histogram["sync"].observe(time.perf_counter() - start)
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait_histogram["async"].observe(time.perf_counter() - start)
+
+
 engine = create_engine(
     DATABASE_URL,
-    pool_size=10,            
+    poolclass=TimedQueuePool,
+    pool_size=10,
     max_overflow=40,
     pool_timeout=360,
     pool_recycle=3600,
@@ -22,3 +67,35 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# O engine assíncrono só abre conexões quando usado, então pode existir mesmo com DB_ASYNC=False
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    pool_size=10,
+    max_overflow=40,
+    pool_timeout=360,
+    pool_recycle=3600,
+    pool_pre_ping=True,
+    connect_args={"server_settings": {"timezone": "America/Sao_Paulo"}}
+)
+
+AsyncSessionLocal = async_sessionmaker(autoflush=False, bind=async_engine, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Eventos de cursor: contagem e tempo de SQL por requisição (Server-Timing)
+if SQL_TIMING_ENABLED:
+    instrument(engine)
+    instrument(async_engine.sync_engine)
+
+# Gauges do pool lidos na coleta do /metrics
+for kind, pool in (("sync", engine.pool), ("async", async_engine.pool)):
+    registry.gauge("db_pool_size", "Tamanho configurado do pool", pool.size, labels={"engine": kind})
+    registry.gauge("db_pool_checked_out", "Conexões em uso", pool.checkedout, labels={"engine": kind})
+    registry.gauge("db_pool_overflow", "Conexões acima de pool_size (negativo: ainda não abertas)", pool.overflow, labels={"engine": kind})
+    registry.gauge("db_pool_checked_in", "Conexões livres no pool", pool.checkedin, labels={"engine": kind})
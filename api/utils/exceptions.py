@@ -13,6 +13,12 @@ def exception_401_UNAUTHORIZED(detail: str) -> HTTPException:
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+def exception_403_FORBIDDEN(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=403,
+        detail=detail,
+    )
+
 def exception_404_NOT_FOUND(detail: str) -> HTTPException:
     return HTTPException(
         status_code=404,
@@ -23,4 +29,11 @@ def exception_500_INTERNAL_SERVER_ERROR(detail: str) -> HTTPException:
     return HTTPException(
         status_code=500,
         detail=detail,
-    )
\ No newline at end of file
+    )
+
+def exception_503_SERVICE_UNAVAILABLE(detail: str, retry_after: int = 1) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=detail,
+        headers={"Retry-After": str(retry_after)},
+    )
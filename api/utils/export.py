@@ -0,0 +1,71 @@
+import csv
+from datetime import datetime
+from enum import Enum
+import io
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List
+from uuid import UUID
+
+from pydantic_core import to_json
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return "|".join(str(item) for item in value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_batch(rows: List[Dict[str, Any]], export_format: ExportFormat, fields: List[str]) -> bytes:
+    """Codifica um lote de linhas em um único chunk (menos escritas no socket por linha)"""
+    if export_format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows([[_csv_value(row[field]) for field in fields] for row in rows])
+        return buffer.getvalue().encode("utf-8")
+    return b"".join(to_json(row) + b"\n" for row in rows)
+
+
+def _header(export_format: ExportFormat, fields: List[str]) -> bytes:
+    if export_format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(fields)
+        return buffer.getvalue().encode("utf-8")
+    return b""
+
+
+def iter_export(
+    batches: Iterable[List[Dict[str, Any]]],
+    export_format: ExportFormat,
+    fields: List[str]
+) -> Iterator[bytes]:
+    header = _header(export_format, fields)
+    if header:
+        yield header
+    for rows in batches:
+        yield encode_batch(rows, export_format, fields)
+
+
+async def aiter_export(
+    batches: AsyncIterator[List[Dict[str, Any]]],
+    export_format: ExportFormat,
+    fields: List[str]
+) -> AsyncIterator[bytes]:
+    header = _header(export_format, fields)
+    if header:
+        yield header
+    async for rows in batches:
+        yield encode_batch(rows, export_format, fields)
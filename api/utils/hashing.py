@@ -0,0 +1,140 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from decouple import config
+
+from api.utils.exceptions import exception_503_SERVICE_UNAVAILABLE
+from api.utils.metrics import registry
+
+# bcrypt libera o GIL durante o hash, então um pool de threads já tira o custo do event loop.
+# HASH_POOL_KIND=process usa processos (isolamento total, custo maior de IPC).
+HASH_POOL_KIND = config("HASH_POOL_KIND", default="thread")
+HASH_POOL_SIZE = config("HASH_POOL_SIZE", default=4, cast=int)
+# Quantidade máxima de hashes aguardando/executando antes de responder 503
+HASH_QUEUE_LIMIT = config("HASH_QUEUE_LIMIT", default=64, cast=int)
+
+
+HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5, 5.0)
+hash_run_histogram = registry.histogram(
+    "password_hash_seconds", "Duração do bcrypt no worker (hash e verificação)", buckets=HASH_BUCKETS
+)
+hash_wait_histogram = registry.histogram(
+    "password_hash_wait_seconds", "Espera na fila do pool de hash", buckets=HASH_BUCKETS
+)
+
+
+def _timed_call(func: Callable[..., Any], *args: Any):
+    # Executa no worker e devolve também o tempo gasto só no hash (sem a espera na fila)
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class HashExecutor:
+    """
+    Pool limitado para operações de hash de senha (bcrypt).
+
+    - Rejeita com 503 quando há mais de max_pending operações pendentes
+    - Mantém contadores simples para métricas (stats)
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 4, max_pending: int = 64):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Executor = None
+
+        self.pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.run_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.max_run_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        # Criado sob demanda para não abrir processos/threads só por importar o módulo
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise exception_503_SERVICE_UNAVAILABLE(
+                detail="Servidor ocupado processando senhas. Tente novamente em instantes."
+            )
+
+        self.pending += 1
+        self.submitted += 1
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            result, run_seconds = await loop.run_in_executor(
+                self._get_executor(), _timed_call, func, *args
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+
+        wait_seconds = (time.perf_counter() - start) - run_seconds
+        self.completed += 1
+        self.run_seconds += run_seconds
+        self.wait_seconds += wait_seconds
+        self.max_run_seconds = max(self.max_run_seconds, run_seconds)
+        hash_run_histogram.observe(run_seconds)
+        hash_wait_histogram.observe(wait_seconds)
+        return result
+
+    async def run_many(self, func: Callable[..., Any], args_list: List[Tuple[Any, ...]]) -> List[Any]:
+        """
+        Executa várias operações em janelas que cabem na fila (uso em lote, ex: importação).
+        Cada janela ocupa no máximo metade da fila para não derrubar as requisições comuns.
+        """
+        window = max(1, min(self.max_workers * 2, self.max_pending // 2))
+        results: List[Any] = []
+        for start in range(0, len(args_list), window):
+            batch = args_list[start:start + window]
+            results.extend(await asyncio.gather(*[self.run(func, *args) for args in batch]))
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "workers": self.max_workers,
+            "queue_limit": self.max_pending,
+            "pending": self.pending,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "run_seconds_total": self.run_seconds,
+            "wait_seconds_total": self.wait_seconds,
+            "run_seconds_max": self.max_run_seconds,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+hash_executor = HashExecutor(
+    kind=HASH_POOL_KIND,
+    max_workers=HASH_POOL_SIZE,
+    max_pending=HASH_QUEUE_LIMIT
+)
+
+registry.gauge("password_hash_pending", "Hashes aguardando ou executando no pool", lambda: hash_executor.pending)
+registry.gauge("password_hash_rejected_total", "Hashes rejeitados com 503 (fila cheia)", lambda: hash_executor.rejected)
@@ -0,0 +1,44 @@
+from typing import Hashable, List, Optional
+
+from decouple import config
+
+from api.utils.cache import ResponseCache
+from api.utils.counting import CountMode, count_cache_key
+from api.utils.db_filter import FilterCondition
+
+# Cache das páginas de listagem já serializadas (por processo).
+# Escritas no próprio processo incrementam a geração; o TTL cobre as de outros processos.
+LIST_CACHE_ENABLED = config("LIST_CACHE_ENABLED", default=True, cast=bool)
+LIST_CACHE_MAX_BYTES = config("LIST_CACHE_MAX_BYTES", default=16 * 1024 * 1024, cast=int)
+LIST_CACHE_TTL = config("LIST_CACHE_TTL", default=30, cast=float)
+list_cache = ResponseCache(max_bytes=LIST_CACHE_MAX_BYTES, ttl=LIST_CACHE_TTL)
+
+
+def list_cache_key(
+    table_name: str,
+    skip: int = 0,
+    limit: int = 10,
+    sort_by: Optional[str] = None,
+    sort_dir: str = "asc",
+    search: Optional[str] = None,
+    filter_conditions: Optional[List[FilterCondition]] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    count: Optional[CountMode] = None
+) -> Hashable:
+    """
+    Chave normalizada da página: mesma regra do count (search prevalece sobre os filtros).
+    Também é a chave do single-flight, então só pode juntar requisições que geram o mesmo SQL:
+    search e valores dos filtros entram exatamente como vieram.
+    """
+    filters = None if search else filter_conditions
+    return (
+        count_cache_key(table_name, search, filters),
+        skip,
+        limit,
+        sort_by,
+        sort_dir.lower(),
+        cursor,
+        tuple(fields or ()),
+        count.value if count else None,
+    )
@@ -0,0 +1,158 @@
+import asyncio
+from collections import deque
+import json
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Callable, Deque, Dict, Optional
+import weakref
+
+from decouple import config
+
+from api.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: mede o atraso do event loop e captura a pilha quando ele trava
+LOOP_WATCHDOG_ENABLED = config("LOOP_WATCHDOG_ENABLED", default=False, cast=bool)
+# Intervalo do "batimento" no loop (segundos)
+LOOP_WATCHDOG_INTERVAL = config("LOOP_WATCHDOG_INTERVAL", default=0.05, cast=float)
+# Travamento acima disso (ms) captura a pilha da thread do loop e a rota em execução
+LOOP_WATCHDOG_STALL_MS = config("LOOP_WATCHDOG_STALL_MS", default=100, cast=float)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class LoopWatchdog:
+    """
+    Detector de bloqueio do event loop.
+
+    - Uma task no loop dorme `interval` e mede quanto acordou atrasada (lag)
+    - Uma thread separada confere o último batimento; se o loop ficou parado mais que
+      stall_ms, captura a pilha da thread do loop e a requisição da task em execução
+    """
+
+    def __init__(self, interval: float = 0.05, stall_ms: float = 100, history: int = 20):
+        self.interval = interval
+        self.stall_ms = stall_ms
+        self.lag_histogram = registry.histogram(
+            "event_loop_lag_seconds", "Atraso do event loop em relação ao agendado", buckets=LAG_BUCKETS
+        )
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=history)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._beat = time.monotonic()
+        self._reported_beat = 0.0
+        # Task da requisição -> scope ASGI (preenchido pelo LoopWatchdogMiddleware)
+        self._scopes: "weakref.WeakKeyDictionary[asyncio.Task, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._monitor())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def track(self, scope: Dict[str, Any]) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._scopes[task] = scope
+
+    def untrack(self) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._scopes.pop(task, None)
+
+    async def _monitor(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start - self.interval)
+            self.lag_histogram.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+            self._beat = time.monotonic()
+
+    def _watch(self) -> None:
+        limit = self.interval + self.stall_ms / 1000
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            stalled = time.monotonic() - beat
+            # Uma captura por travamento (o mesmo batimento não é reportado duas vezes)
+            if stalled > limit and beat != self._reported_beat:
+                self._reported_beat = beat
+                self._capture((stalled - self.interval) * 1000)
+
+    def _capture(self, stalled_ms: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame) if frame is not None else []
+        # Leitura de outra thread: é só um diagnóstico, a task pode mudar logo depois
+        task = asyncio.current_task(self._loop)
+        scope = self._scopes.get(task) if task is not None else None
+        route = scope.get("route") if scope else None
+
+        stall = {
+            "stalled_ms": round(stalled_ms, 1),
+            "at": time.time(),
+            "method": scope["method"] if scope else None,
+            "path": scope["path"] if scope else None,
+            "route": getattr(route, "path", None),
+            "task": task.get_name() if task is not None else None,
+        }
+        self.stalls += 1
+        self.recent.append(stall)
+        logger.warning("event_loop_stall %s", json.dumps({**stall, "stack": "".join(stack)}, ensure_ascii=False))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self._task is not None,
+            "interval": self.interval,
+            "stall_ms": self.stall_ms,
+            "max_lag_seconds": self.max_lag,
+            "stalls": self.stalls,
+            "lag_seconds": self.lag_histogram.snapshot(),
+            "recent_stalls": list(self.recent),
+        }
+
+
+loop_watchdog = LoopWatchdog(interval=LOOP_WATCHDOG_INTERVAL, stall_ms=LOOP_WATCHDOG_STALL_MS)
+
+registry.gauge("event_loop_stalls_total", "Travamentos do event loop acima do limite", lambda: loop_watchdog.stalls)
+
+
+class LoopWatchdogMiddleware:
+    """Associa a task de cada requisição ao scope, para o watchdog saber qual rota travou o loop"""
+
+    def __init__(self, app: Any, watchdog: LoopWatchdog = loop_watchdog):
+        self.app = app
+        self.watchdog = watchdog
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.watchdog.track(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.watchdog.untrack()
@@ -0,0 +1,186 @@
+from bisect import bisect_left
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from decouple import config
+
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=bool)
+
+# Buckets de latência em segundos (mesmos padrões do client oficial do Prometheus)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Métodos fora desta lista (enviados livremente pelo cliente) viram "OTHER" no label
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE"})
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Optional[Dict[str, Any]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class Histogram:
+    """
+    Histograma com buckets fixos: observe só incrementa contadores pré-alocados.
+    Sem lock: incrementos concorrentes de threads podem, raramente, perder uma amostra.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: Optional[Dict[str, str]] = None) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels({**(labels or {}), 'le': str(bound)})} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {self.sum}")
+        lines.append(f"{name}_count{_labels(labels)} {self.count}")
+        return lines
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip([str(bound) for bound in (*self.buckets, "+Inf")], self.counts)),
+        }
+
+
+class RouteMetrics:
+    __slots__ = ("statuses", "latency")
+
+    def __init__(self):
+        self.statuses: Dict[int, int] = {}
+        self.latency = Histogram()
+
+
+class MetricsRegistry:
+    """
+    Registro em memória (por processo) exposto no formato texto do Prometheus.
+
+    - Rotas: contagem por status e histograma de latência, por (método, template da rota)
+    - Histogramas e gauges nomeados registrados pelos módulos (pool, hash de senha, ...)
+    """
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self.in_flight = 0
+        self._histograms: Dict[str, Tuple[str, Dict[Tuple, Histogram], Tuple[float, ...]]] = {}
+        self._gauges: Dict[str, Tuple[str, List[Tuple[Dict[str, str], Callable[[], float]]]]] = {}
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+        labels: Optional[Dict[str, str]] = None
+    ) -> Histogram:
+        """Retorna o histograma (criado na primeira chamada) para guardar e usar no caminho quente"""
+        if name not in self._histograms:
+            self._histograms[name] = (help, {}, buckets)
+        _, series, default_buckets = self._histograms[name]
+        key = tuple(sorted((labels or {}).items()))
+        if key not in series:
+            series[key] = Histogram(default_buckets)
+        return series[key]
+
+    def gauge(self, name: str, help: str, func: Callable[[], float], labels: Optional[Dict[str, str]] = None) -> None:
+        """Gauge lido apenas na coleta (func é chamada a cada GET /metrics)"""
+        self._gauges.setdefault(name, (help, []))[1].append((labels or {}, func))
+
+    def route(self, method: str, path: str) -> RouteMetrics:
+        key = (method, path)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            metrics = self.routes[key] = RouteMetrics()
+        return metrics
+
+    def render(self) -> str:
+        lines = [
+            "# HELP http_requests_in_flight Requisições em andamento",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_requests_total Requisições por rota e status",
+            "# TYPE http_requests_total counter",
+        ]
+        routes = list(self.routes.items())
+        for (method, path), metrics in routes:
+            for status, count in list(metrics.statuses.items()):
+                lines.append(
+                    f"http_requests_total{_labels({'method': method, 'route': path, 'status': status})} {count}"
+                )
+        lines += [
+            "# HELP http_request_duration_seconds Latência por rota",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, path), metrics in routes:
+            lines += metrics.latency.render("http_request_duration_seconds", {"method": method, "route": path})
+
+        for name, (help, series, _) in list(self._histograms.items()):
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} histogram"]
+            for key, histogram in list(series.items()):
+                lines += histogram.render(name, dict(key))
+
+        for name, (help, entries) in list(self._gauges.items()):
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+            for labels, func in entries:
+                lines.append(f"{name}{_labels(labels)} {func()}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI puro (sem BaseHTTPMiddleware): mede cada requisição HTTP.
+    A rota é o template do FastAPI (ex: /api/v1/users/{id}), lido do scope após o roteamento;
+    requisições sem rota (404) ficam em "unmatched" e métodos desconhecidos em "OTHER",
+    para não explodir a cardinalidade.
+    """
+
+    def __init__(self, app: Any, registry: MetricsRegistry = registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.in_flight -= 1
+            route = scope.get("route")
+            method = scope["method"] if scope["method"] in HTTP_METHODS else "OTHER"
+            metrics = self.registry.route(method, getattr(route, "path", "unmatched"))
+            metrics.statuses[status_code] = metrics.statuses.get(status_code, 0) + 1
+            metrics.latency.observe(time.perf_counter() - start)
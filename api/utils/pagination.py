@@ -0,0 +1,98 @@
+import base64
+from datetime import datetime
+import json
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import tuple_
+
+from api.utils.exceptions import exception_400_BAD_REQUEST
+
+# Cada coluna de ordenação é (coluna, desc). A última deve ser única (ex: id) para desempate.
+SortColumns = Sequence[Tuple[Any, bool]]
+# Tipos aceitos nos valores do cursor decodificado
+CURSOR_SCALARS = (str, int, float)
+
+
+def _sort_key(sort_columns: SortColumns) -> str:
+    return ",".join(f"{column.key}:{'desc' if desc else 'asc'}" for column, desc in sort_columns)
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _deserialize(value: Any, column: Any) -> Any:
+    # asyncpg não converte strings implicitamente, então devolvo o tipo Python da coluna
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    # O tipo do valor precisa ser o da coluna (ex: número no lugar de texto daria erro no banco)
+    if not isinstance(value, python_type):
+        raise TypeError(f"valor do cursor para {column.key}")
+    if isinstance(value, str) and "\x00" in value:
+        raise ValueError(f"valor do cursor para {column.key}")
+    return value
+
+
+def encode_cursor(values: Sequence[Any], sort_columns: SortColumns) -> str:
+    """Gera o cursor opaco a partir dos valores de ordenação do último item da página."""
+    payload = {"s": _sort_key(sort_columns), "k": [_serialize(v) for v in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_columns: SortColumns) -> List[Any]:
+    """Lê o cursor e valida se ele pertence à mesma ordenação da requisição."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = payload["k"]
+        sort_key = payload["s"]
+        # Só valores escalares chegam ao SQL (JSON bem formado pode trazer objetos/listas)
+        if not isinstance(values, list) or not all(isinstance(v, CURSOR_SCALARS) for v in values):
+            raise TypeError("valores do cursor")
+    except (ValueError, TypeError, KeyError):
+        raise exception_400_BAD_REQUEST(detail="Cursor inválido")
+
+    if sort_key != _sort_key(sort_columns) or len(values) != len(sort_columns):
+        raise exception_400_BAD_REQUEST(
+            detail="Cursor não corresponde à ordenação informada (sort_by/sort_dir)"
+        )
+
+    try:
+        return [_deserialize(v, column) for v, (column, _) in zip(values, sort_columns)]
+    except (ValueError, TypeError, AttributeError):
+        raise exception_400_BAD_REQUEST(detail="Cursor inválido")
+
+
+def build_keyset_filter(sort_columns: SortColumns, values: Sequence[Any]):
+    """
+    Filtro keyset: (col1, col2, ...) > (v1, v2, ...) em ordem asc, < em desc.
+    Todas as colunas usam a mesma direção, o que permite a comparação por tupla
+    (row comparison) e o uso de um índice composto na mesma ordem.
+    """
+    columns = [column for column, _ in sort_columns]
+    desc = sort_columns[0][1]
+    if desc:
+        return tuple_(*columns) < tuple_(*values)
+    return tuple_(*columns) > tuple_(*values)
+
+
+def next_cursor(items: Sequence[Any], limit: int, sort_columns: SortColumns) -> Optional[str]:
+    """Cursor da próxima página, ou None quando a página veio incompleta (fim da lista)."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    # Aceita tanto objetos (schemas/ORM) quanto dicts (linhas projetadas)
+    if isinstance(last, Mapping):
+        values = [last[column.key] for column, _ in sort_columns]
+    else:
+        values = [getattr(last, column.key) for column, _ in sort_columns]
+    return encode_cursor(values, sort_columns)
@@ -0,0 +1,195 @@
+import asyncio
+from collections import Counter
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from decouple import config
+from fastapi import HTTPException
+from starlette.datastructures import Headers, MutableHeaders
+
+from api.utils.security import get_current_principal
+from api.v1._shared.models import PermissionType
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: perfil sob demanda de requisições de ADMIN com o header X-Profile: 1
+PROFILING_ENABLED = config("PROFILING_ENABLED", default=False, cast=bool)
+PROFILE_DIR = config("PROFILE_DIR", default="/tmp/api-profiles")
+# Limite global: no máximo um perfil por vez e um a cada PROFILE_MIN_INTERVAL segundos
+PROFILE_MIN_INTERVAL = config("PROFILE_MIN_INTERVAL", default=60, cast=float)
+PROFILE_SAMPLE_INTERVAL = config("PROFILE_SAMPLE_INTERVAL", default=0.005, cast=float)
+PROFILE_MAX_SECONDS = config("PROFILE_MAX_SECONDS", default=30, cast=float)
+
+PROFILE_HEADER = "x-profile"
+
+
+def _frame_name(frame: Any) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Profiler por amostragem: uma thread lê a pilha da thread do event loop a cada intervalo
+    e conta só as amostras em que o loop está executando a task da requisição.
+    Resultado no formato "collapsed" (frame;frame;frame contagem), pronto para flamegraph.pl/speedscope.
+    Trabalho enviado ao threadpool (dependências síncronas, hash) não aparece nas amostras.
+    """
+
+    def __init__(self, task: asyncio.Task, interval: float, max_seconds: float):
+        self.task = task
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.loop = asyncio.get_running_loop()
+        self.thread_id = threading.get_ident()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.other = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            # Leitura de outra thread: pode pegar a task trocando; é amostragem, não é exata
+            if asyncio.current_task(self.loop) is not self.task:
+                self.other += 1
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            names: List[str] = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI: perfila a requisição quando o header X-Profile está presente
+    e o token é de um ADMIN (validação stateless, sem consulta ao banco).
+    O perfil é gravado em PROFILE_DIR e o arquivo volta no header X-Profile-Id.
+    Fora do limite global, a requisição segue normalmente com X-Profile: rate-limited.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+        self._active = False
+        self._last_start = float("-inf")
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not headers.get(PROFILE_HEADER) or not await self._is_admin(headers):
+            await self.app(scope, receive, send)
+            return
+
+        now = time.monotonic()
+        if self._active or now - self._last_start < PROFILE_MIN_INTERVAL:
+            await self.app(scope, receive, self._with_headers(send, {"X-Profile": "rate-limited"}))
+            return
+
+        self._active = True
+        self._last_start = now
+        sampler = StackSampler(asyncio.current_task(), PROFILE_SAMPLE_INTERVAL, PROFILE_MAX_SECONDS)
+        start = time.perf_counter()
+        finished = False
+
+        async def finish() -> Dict[str, str]:
+            nonlocal finished
+            finished = True
+            elapsed = time.perf_counter() - start
+            # join da thread do sampler e escrita do arquivo fora do event loop
+            profile_id = await asyncio.to_thread(self._finish, scope, sampler, elapsed)
+            return {
+                "X-Profile": "collected",
+                "X-Profile-Id": profile_id,
+                "X-Profile-Samples": str(sampler.samples),
+            }
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            # O perfil cobre a requisição até o início da resposta
+            if message["type"] == "http.response.start" and not finished:
+                response_headers = MutableHeaders(scope=message)
+                for name, value in (await finish()).items():
+                    response_headers.append(name, value)
+            await send(message)
+
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not finished:
+                await finish()
+
+    async def _is_admin(self, headers: Headers) -> bool:
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            principal = await get_current_principal(token)
+        except HTTPException:
+            return False
+        except Exception:
+            # Ex: falha do banco na primeira carga do conjunto de revogação.
+            # A requisição segue sem perfil; o próprio endpoint trata a autenticação.
+            logger.exception("Falha ao validar o token para o perfil; requisição segue sem perfil")
+            return False
+        return PermissionType.ADMIN.value in principal.permissions
+
+    def _with_headers(self, send: Callable, extra: Dict[str, str]) -> Callable:
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for name, value in extra.items():
+                    response_headers.append(name, value)
+            await send(message)
+        return send_wrapper
+
+    def _finish(self, scope: Dict[str, Any], sampler: StackSampler, elapsed: float) -> str:
+        # Roda numa thread; libera o próximo perfil mesmo se a requisição for cancelada no meio
+        try:
+            sampler.stop()
+            return self._store(scope, sampler, elapsed)
+        finally:
+            self._active = False
+
+    def _store(self, scope: Dict[str, Any], sampler: StackSampler, elapsed: float) -> str:
+        route = getattr(scope.get("route"), "path", scope["path"])
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        profile_id = f"{int(time.time() * 1000)}-{scope['method']}-{slug}"
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            with open(os.path.join(PROFILE_DIR, f"{profile_id}.collapsed"), "w") as output:
+                output.write(sampler.collapsed())
+        except OSError:
+            # Falha ao gravar não pode derrubar a resposta da requisição perfilada
+            logger.exception("Não foi possível gravar o perfil %s", profile_id)
+        logger.info("request_profile %s", json.dumps({
+            "id": profile_id,
+            "method": scope["method"],
+            "route": route,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "samples": sampler.samples,
+            "other_task_samples": sampler.other,
+        }))
+        return profile_id
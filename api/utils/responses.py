@@ -0,0 +1,15 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse serializado pelo pydantic-core (UUID e datetime nativos).
+    Retornar esta resposta direto no endpoint evita a validação do response_model
+    do FastAPI, usado nas leituras que já vêm no formato final do banco.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
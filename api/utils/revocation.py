@@ -0,0 +1,129 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from api.v1._shared.models import User
+
+logger = logging.getLogger(__name__)
+
+
+def _changes_statement(since: datetime):
+    # Servida pelo índice ix_user_updated_at (index-only scan com o id incluído)
+    return select(User.id, User.updated_at).where(User.updated_at > since).order_by(User.updated_at)
+
+
+class RevocationSet:
+    """
+    Conjunto em memória de usuários cujos access tokens não valem mais.
+
+    Guarda user_id -> instante da revogação. Um token emitido (iat) antes desse
+    instante é recusado: usuário excluído ou com dados/permissões alterados
+    (as claims do token ficaram desatualizadas e o cliente precisa fazer refresh).
+
+    É atualizado de forma incremental lendo "user" por updated_at > última marca,
+    e só precisa lembrar da janela de vida de um access token (max_age).
+    Cada leitura volta "overlap" no tempo para pegar transações que gravaram
+    updated_at antes da marca mas fizeram commit depois.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_age: timedelta,
+        refresh_interval: float = 5.0,
+        overlap: timedelta = timedelta(seconds=30)
+    ):
+        self.session_factory = session_factory
+        self.max_age = max_age
+        self.refresh_interval = refresh_interval
+        self.overlap = overlap
+
+        self._revoked: Dict[UUID, datetime] = {}
+        self._lock = threading.Lock()
+        self._watermark: Optional[datetime] = None
+        self._last_refresh = 0.0
+        self._refreshing: Optional[asyncio.Lock] = None
+
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def mark(self, user_id: UUID, revoked_at: Optional[datetime] = None) -> None:
+        """Revoga imediatamente os tokens emitidos até agora (usado nas escritas deste processo)."""
+        revoked_at = revoked_at or datetime.now(timezone.utc)
+        with self._lock:
+            current = self._revoked.get(user_id)
+            if current is None or revoked_at > current:
+                self._revoked[user_id] = revoked_at
+
+    def is_revoked(self, user_id: UUID, issued_at: datetime) -> bool:
+        revoked_at = self._revoked.get(user_id)
+        return revoked_at is not None and issued_at < revoked_at
+
+    def refresh(self) -> None:
+        """Lê as alterações desde a última marca (síncrono, roda em thread)."""
+        now = datetime.now(timezone.utc)
+        horizon = now - self.max_age
+        watermark = self._watermark or horizon
+
+        db = self.session_factory()
+        try:
+            rows = db.execute(_changes_statement(watermark - self.overlap)).all()
+        finally:
+            db.close()
+
+        with self._lock:
+            for user_id, updated_at in rows:
+                current = self._revoked.get(user_id)
+                if current is None or updated_at > current:
+                    self._revoked[user_id] = updated_at
+            if rows:
+                watermark = max(watermark, rows[-1].updated_at)
+            # Tokens emitidos antes do horizonte já expiraram, não preciso mais das entradas
+            self._revoked = {k: v for k, v in self._revoked.items() if v >= horizon}
+
+        self._watermark = max(watermark, horizon)
+        self._last_refresh = time.monotonic()
+        self.refreshes += 1
+
+    async def ensure_fresh(self) -> None:
+        """
+        Garante que o conjunto não está mais velho que refresh_interval.
+        Só uma corrotina faz o refresh; as demais seguem com o conjunto atual,
+        exceto na primeira carga, que todas aguardam.
+        """
+        if time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+
+        if self._refreshing is None:
+            self._refreshing = asyncio.Lock()
+
+        loaded = self._watermark is not None
+        if loaded and self._refreshing.locked():
+            return
+
+        async with self._refreshing:
+            if time.monotonic() - self._last_refresh < self.refresh_interval:
+                return
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception:
+                self.refresh_errors += 1
+                logger.exception("Falha ao atualizar o conjunto de revogação")
+                # Sem a carga inicial não dá para garantir nada: propaga o erro
+                if not loaded:
+                    raise
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "size": len(self._revoked),
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
@@ -4,12 +4,20 @@ from decouple import config
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import List
 from uuid import UUID
 
-from api.utils.db_services import get_db
-from api.utils.exceptions import exception_401_UNAUTHORIZED
-from api.v1._shared.models import User
+from api.utils.cache import TTLCache
+from api.utils.db_filter import iequals_filter
+from api.utils.db_services import DB_ASYNC, SessionLocal, get_async_db, get_db
+from api.utils.exceptions import exception_401_UNAUTHORIZED, exception_403_FORBIDDEN
+from api.utils.hashing import hash_executor
+from api.utils.revocation import RevocationSet
+from api.v1._shared.models import PermissionType, User
+from api.v1._shared.schemas import TokenPrincipal
 
 
 JWT_SECRET_KEY = str(config("JWT_SECRET_KEY")).strip()
@@ -19,6 +27,21 @@ REFRESH_TOKEN_EXPIRE_DAYS = int(config("REFRESH_TOKEN_EXPIRE_DAYS"))
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/account/login")
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Cache do usuário autenticado por id, evita o SELECT em toda requisição autenticada.
+# É por processo: alterações feitas por outro worker aparecem no máximo após o TTL.
+PRINCIPAL_CACHE_SIZE = config("PRINCIPAL_CACHE_SIZE", default=10000, cast=int)
+PRINCIPAL_CACHE_TTL = config("PRINCIPAL_CACHE_TTL", default=30, cast=float)
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+
+# Autenticação stateless (get_current_principal): só as claims do token + conjunto de revogação
+STATELESS_AUTH = config("STATELESS_AUTH", default=False, cast=bool)
+REVOCATION_REFRESH_SECONDS = config("REVOCATION_REFRESH_SECONDS", default=5, cast=float)
+revocations = RevocationSet(
+    session_factory=SessionLocal,
+    max_age=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+    refresh_interval=REVOCATION_REFRESH_SECONDS
+)
+
 def verify_password(plain_password, hashed_password) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -27,11 +50,28 @@ def get_password_hash(password) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    """verify_password executado no pool de hash, sem bloquear o event loop."""
+    return await hash_executor.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password) -> str:
+    """get_password_hash executado no pool de hash, sem bloquear o event loop."""
+    return await hash_executor.run(get_password_hash, password)
+
+
+async def get_password_hashes_async(passwords: List[str]) -> List[str]:
+    """Hash de várias senhas em paralelo no pool de hash (importação em lote)."""
+    return await hash_executor.run_many(get_password_hash, [(password,) for password in passwords])
+
+
 def create_access_token(data: dict) -> str:
     """Cria um access token."""
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "type": "access"})
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    # iat com fração de segundo: comparado com updated_at no conjunto de revogação
+    to_encode.update({"exp": expire, "iat": now.timestamp(), "type": "access"})
     
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     if isinstance(encoded_jwt, bytes):
@@ -80,16 +120,18 @@ def verify_refresh_token(token: str) -> dict:
 
 def authenticate_user(db: Session, email: str, senha: str) -> User:
     """Autentica um usuário pelo email e senha."""
-    usuario = db.query(User).filter(User.email == email).first()
+    usuario = db.query(User).filter(iequals_filter(User.email, email)).first()
     if not usuario or not verify_password(senha, usuario.password):
         return False
     return usuario
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    """Retorna o usuário atual autenticado através do token JWT."""
+def _decode_access_token(token: str) -> UUID:
+    """Valida o access token JWT e retorna o ID do usuário (sub)."""
+    return _decode_access_payload(token)[0]
+
+
+def _decode_access_payload(token: str):
+    """Valida o access token JWT e retorna (ID do usuário, payload)."""
     credentials_exception = exception_401_UNAUTHORIZED(
         detail="Could not validate credentials",
     )
@@ -116,16 +158,116 @@ def get_current_user(
         raise credentials_exception
     
     try:
-        user_uuid = UUID(user_id)
+        return UUID(user_id), payload
     except (ValueError, TypeError):
         raise credentials_exception
-    
-    usuario = db.query(User).filter(
+
+
+def _current_user_statement(user_uuid: UUID):
+    return select(User).where(
         User.id == user_uuid,
         User.flg_deleted == False
-    ).first()
+    )
+
+
+def _cache_principal(usuario: User) -> None:
+    # Guardo uma cópia fora da sessão para que o objeto em cache não seja alterado pelo ORM
+    snapshot = User(**{
+        column.key: getattr(usuario, column.key) for column in User.__table__.columns
+    })
+    snapshot.permissions = list(usuario.permissions or [])
+    principal_cache.set(usuario.id, snapshot)
+
+
+def invalidate_principal(user_id: UUID) -> None:
+    """Remove o usuário do cache de autenticação (chamar após update/delete)."""
+    principal_cache.delete(user_id)
+    revocations.mark(user_id)
+
+
+def get_current_user_sync(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> User:
+    """Retorna o usuário atual autenticado através do token JWT."""
+    user_uuid = _decode_access_token(token)
+    
+    cached = principal_cache.get(user_uuid)
+    if cached is not None:
+        return cached
+    
+    usuario = db.execute(_current_user_statement(user_uuid)).scalars().first()
     
     if usuario is None:
-        raise credentials_exception
+        raise exception_401_UNAUTHORIZED(detail="Could not validate credentials")
     
+    _cache_principal(usuario)
     return usuario
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """Mesmo que get_current_user_sync, mas usando AsyncSession."""
+    user_uuid = _decode_access_token(token)
+    
+    cached = principal_cache.get(user_uuid)
+    if cached is not None:
+        return cached
+    
+    result = await db.execute(_current_user_statement(user_uuid))
+    usuario = result.scalars().first()
+    
+    if usuario is None:
+        raise exception_401_UNAUTHORIZED(detail="Could not validate credentials")
+    
+    _cache_principal(usuario)
+    return usuario
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+) -> TokenPrincipal:
+    """
+    Autenticação stateless: monta a identidade a partir das claims do access token,
+    sem consultar o usuário no banco. Tokens de usuários excluídos ou alterados
+    depois da emissão são recusados pelo conjunto de revogação.
+    """
+    user_uuid, payload = _decode_access_payload(token)
+    credentials_exception = exception_401_UNAUTHORIZED(
+        detail="Could not validate credentials",
+    )
+
+    issued_at = payload.get("iat")
+    if issued_at is None:
+        raise credentials_exception
+
+    await revocations.ensure_fresh()
+    if revocations.is_revoked(user_uuid, datetime.fromtimestamp(issued_at, timezone.utc)):
+        raise exception_401_UNAUTHORIZED(
+            detail="Token revogado. Faça login ou renove o token.",
+        )
+
+    try:
+        return TokenPrincipal(
+            id=user_uuid,
+            name=payload.get("name"),
+            email=payload.get("email"),
+            permissions=payload.get("permissions") or [],
+        )
+    except ValueError:
+        raise credentials_exception
+
+
+# Os controllers usam get_current_user; a implementação segue o DB_ASYNC
+get_current_user = get_current_user_async if DB_ASYNC else get_current_user_sync
+
+
+def get_current_admin(
+    current_user: User = Depends(get_current_user),
+) -> User:
+    """Usuário autenticado com permissão ADMIN (operações em lote/administrativas)."""
+    if PermissionType.ADMIN.value not in (current_user.permissions or []):
+        raise exception_403_FORBIDDEN(detail="Operação permitida apenas para administradores")
+    return current_user
@@ -0,0 +1,94 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from decouple import config
+
+from api.utils.exceptions import exception_503_SERVICE_UNAVAILABLE
+
+# Leituras idênticas e simultâneas esperam uma única consulta em andamento
+SINGLE_FLIGHT_ENABLED = config("SINGLE_FLIGHT_ENABLED", default=True, cast=bool)
+# Tempo máximo que uma requisição espera pela consulta de outra antes de responder 503
+SINGLE_FLIGHT_TIMEOUT = config("SINGLE_FLIGHT_TIMEOUT", default=5.0, cast=float)
+
+
+class _LeaderCancelled(Exception):
+    """A requisição que executava a consulta foi cancelada (ex: cliente desconectou)."""
+
+
+class SingleFlight:
+    """
+    Coalescência de chamadas concorrentes com a mesma chave (por event loop).
+
+    - A primeira chamada (líder) executa func; as demais aguardam o mesmo resultado
+    - Exceções do líder são repassadas a todos que aguardavam
+    - Se o líder for cancelado, quem aguardava tenta de novo (um deles vira o novo líder)
+    - O resultado é compartilhado: quem recebe não deve alterá-lo
+    """
+
+    def __init__(self, timeout: float = 5.0):
+        self.timeout = timeout
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+        self.leaders = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                return await self._lead(key, func)
+
+            self.coalesced += 1
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise exception_503_SERVICE_UNAVAILABLE(
+                    detail="Tempo esgotado aguardando a consulta. Tente novamente em instantes."
+                )
+            except _LeaderCancelled:
+                continue
+
+    async def _lead(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.leaders += 1
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except Exception as e:
+            self.errors += 1
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+            # Marca a exceção como lida: sem seguidores o asyncio registraria "never retrieved"
+            if future.done() and not future.cancelled():
+                future.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "timeout": self.timeout,
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
+
+
+user_reads = SingleFlight(timeout=SINGLE_FLIGHT_TIMEOUT)
+
+
+async def coalesce(key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+    if not SINGLE_FLIGHT_ENABLED:
+        return await func()
+    return await user_reads.do(key, func)
@@ -0,0 +1,148 @@
+from contextvars import ContextVar
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from decouple import config
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+SQL_TIMING_ENABLED = config("SQL_TIMING_ENABLED", default=True, cast=bool)
+# Requisições com mais tempo de banco que isso registram todos os statements no log
+SQL_SLOW_REQUEST_MS = config("SQL_SLOW_REQUEST_MS", default=200, cast=float)
+# Limite de statements guardados por requisição (o contador continua depois disso)
+SQL_MAX_STATEMENTS = config("SQL_MAX_STATEMENTS", default=100, cast=int)
+
+
+class RequestQueries:
+    """Consultas executadas durante uma requisição (acumuladas pelos eventos do engine)"""
+
+    __slots__ = ("count", "total_ms", "slowest_ms", "slowest_statement", "statements", "repeated")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: List[Tuple[str, float]] = []
+        self.repeated: Dict[Tuple[str, str], int] = {}
+
+    def record(self, statement: str, elapsed_ms: float, parameters: Optional[str] = None) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+        if len(self.statements) < SQL_MAX_STATEMENTS:
+            self.statements.append((statement, elapsed_ms))
+        # Repetição é o mesmo SQL com os mesmos parâmetros (o mesmo SQL com ids diferentes não conta)
+        if parameters is not None:
+            key = (statement, parameters)
+            self.repeated[key] = self.repeated.get(key, 0) + 1
+
+    def duplicates(self) -> Dict[str, int]:
+        # Execuções idênticas repetidas na requisição (ex: mesmo usuário lido na auth e no endpoint)
+        result: Dict[str, int] = {}
+        for (statement, _), count in self.repeated.items():
+            if count > 1:
+                result[statement] = result.get(statement, 0) + count
+        return result
+
+    def server_timing(self, app_ms: float) -> str:
+        return f'db;dur={self.total_ms:.1f};desc="{self.count} queries", app;dur={app_ms:.1f}'
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def current_queries() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    queries = _current.get()
+    if queries is not None:
+        # executemany (lotes) fica fora da detecção de repetição: repr dos parâmetros seria caro
+        queries.record(statement, elapsed_ms, None if executemany else repr(parameters))
+
+
+def _handle_error(exception_context) -> None:
+    # Statement com erro não chega ao after_cursor_execute: descarta o início pendente
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument(engine: Any) -> None:
+    """Registra os eventos no engine síncrono (para o assíncrono, passar async_engine.sync_engine)"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class SQLTimingMiddleware:
+    """
+    Middleware ASGI: abre o acumulador de consultas da requisição (contextvar),
+    envia o header Server-Timing e registra logs estruturados no final.
+
+    A contextvar chega às dependências síncronas (threadpool copia o contexto)
+    e ao caminho asyncpg (o greenlet do SQLAlchemy herda o contexto da task).
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = _current.set(queries)
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", queries.server_timing((time.perf_counter() - start) * 1000))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self._log(scope, queries, (time.perf_counter() - start) * 1000)
+
+    def _log(self, scope: Dict[str, Any], queries: RequestQueries, elapsed_ms: float) -> None:
+        route = scope.get("route")
+        record = {
+            "method": scope["method"],
+            "route": getattr(route, "path", scope["path"]),
+            "elapsed_ms": round(elapsed_ms, 2),
+            "queries": queries.count,
+            "db_ms": round(queries.total_ms, 2),
+            "slowest_ms": round(queries.slowest_ms, 2),
+            "slowest_statement": queries.slowest_statement,
+        }
+        duplicates = queries.duplicates()
+        if duplicates:
+            record["duplicates"] = duplicates
+
+        if queries.total_ms >= SQL_SLOW_REQUEST_MS:
+            record["statements"] = [
+                {"sql": statement, "ms": round(elapsed, 2)} for statement, elapsed in queries.statements
+            ]
+            logger.warning("slow_request_sql %s", json.dumps(record, ensure_ascii=False))
+        elif duplicates:
+            # Informativo: não deve competir com os avisos de requisição lenta
+            logger.info("duplicate_sql %s", json.dumps(record, ensure_ascii=False))
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug("request_sql %s", json.dumps(record, ensure_ascii=False))
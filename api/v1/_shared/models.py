@@ -10,7 +10,10 @@ from sqlalchemy import (
     Boolean,
     Column,
     DateTime, 
+    Index,
     String,
+    func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import  declarative_base
@@ -31,7 +34,7 @@ def get_permissions() -> List[str]:
 
 class BaseModel(Base):
     __abstract__ = True
-    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(tz), nullable=False)
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(tz), onupdate=lambda: datetime.now(tz), nullable=False)
     flg_deleted = Column(Boolean, default=False, nullable=False, server_default='false')
@@ -44,3 +47,35 @@ class User(BaseModel):
     email = Column(String(255), nullable=False, unique=True, index=True)   
     password = Column(String(255), nullable=True)
     permissions = Column(ARRAY(String), nullable=False, default=list, server_default='{}')
+
+    __table_args__ = (
+        # Índices trigram (pg_trgm) para busca por substring: ILIKE '%termo%'
+        Index('ix_user_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_user_email_trgm', 'email', postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}),
+    )
+
+
+# Índices funcionais para igualdade case-insensitive: lower(coluna) = lower(valor)
+# Email é único ignorando maiúsculas: login e buscas por email comparam lower(email)
+Index('ix_user_email_lower_unique', func.lower(User.email), unique=True)
+Index('ix_user_name_lower', func.lower(User.name))
+
+# Índices parciais só com os ativos (NOT flg_deleted), na ordem da listagem e cobrindo o UserResponse
+Index(
+    'ix_user_active_created_at', User.created_at.desc(), User.id.desc(),
+    postgresql_where=text('NOT flg_deleted'),
+    postgresql_include=['name', 'email', 'permissions', 'updated_at'],
+)
+Index(
+    'ix_user_active_name', User.name, User.id,
+    postgresql_where=text('NOT flg_deleted'),
+    postgresql_include=['email', 'permissions', 'created_at', 'updated_at'],
+)
+Index(
+    'ix_user_active_email', User.email, User.id,
+    postgresql_where=text('NOT flg_deleted'),
+    postgresql_include=['name', 'permissions', 'created_at', 'updated_at'],
+)
+
+# Atualização incremental do conjunto de revogação: updated_at > marca, com o id no índice
+Index('ix_user_updated_at', User.updated_at, postgresql_include=['id'])
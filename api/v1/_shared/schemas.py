@@ -1,7 +1,7 @@
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from api.v1._shared.models import BaseModel as CustomBaseModel, get_permissions
 
@@ -95,3 +95,81 @@ class AccountResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+
+class TokenPrincipal(BaseModel):
+    """Identidade montada apenas a partir das claims do access token (sem consulta ao banco)."""
+    id: UUID
+    name: str
+    email: str
+    permissions: List[str] = []
+
+
+class UserImport(BaseModel):
+    """Uma linha do NDJSON de importação em lote"""
+    # Limites da tabela de staging (varchar(255)): linha fora do limite vira "invalid",
+    # em vez de derrubar o COPY (psycopg2 e asyncpg) da importação inteira
+    name: str = Field(max_length=255)
+    email: str = Field(max_length=255)
+    password: str = Field(max_length=255)
+    permissions: List[str] = Field(default_factory=lambda: ["USER"])
+
+    @field_validator('name', 'email', 'password')
+    @classmethod
+    def validate_sem_nul(cls, v: str) -> str:
+        # O PostgreSQL não aceita o caractere NUL em texto: o COPY falharia
+        if "\x00" in v:
+            raise ValueError("Texto não pode conter o caractere NUL")
+        return v
+
+    @field_validator('permissions')
+    @classmethod
+    def validate_permissoes(cls, v: List[str]) -> List[str]:
+        valid_perms = set(get_permissions())
+        invalid = set(v) - valid_perms
+        if invalid:
+            raise ValueError(f"Permissões inválidas: {', '.join(invalid)}. Permissões válidas: {', '.join(valid_perms)}")
+        return v
+
+
+class UserImportResult(BaseModel):
+    line: int
+    status: str
+    email: Optional[str] = None
+    id: Optional[UUID] = None
+    error: Optional[str] = None
+
+
+class UserImportReport(BaseModel):
+    total: int
+    created: int
+    failed: int
+    results: List[UserImportResult]
+
+
+class UserBatchDelete(BaseModel):
+    ids: List[UUID]
+
+
+class UserBatchResult(BaseModel):
+    index: int
+    id: Optional[UUID] = None
+    status: str
+    error: Optional[str] = None
+    user: Optional[UserResponse] = None
+
+
+class UserBatchReport(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[UserBatchResult]
+
+
+class UserBatchGet(BaseModel):
+    ids: List[UUID]
+
+
+class UserBatchGetResult(BaseModel):
+    id: UUID
+    found: bool
+    user: Optional[UserResponse] = None
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from api.utils.db_services import get_db
+from api.utils.conditional import is_not_modified, not_modified, set_validators, strong_etag
+from api.utils.db_services import DB_ASYNC, get_async_db, get_db
 from api.utils.exceptions import (
     exception_404_NOT_FOUND,
     exception_500_INTERNAL_SERVER_ERROR,
 )
+from api.utils.responses import FastJSONResponse
 from api.utils.security import get_current_user
 from api.v1._shared.models import User
 from api.v1._shared.schemas import (
@@ -16,7 +19,7 @@ from api.v1._shared.schemas import (
     RefreshTokenResponse,
     TokenResponse,
 )
-from api.v1.account.use_case import AccountUseCase
+from api.v1.account.use_case import AccountUseCase, AsyncAccountUseCase
 
 router = APIRouter(
     prefix="/account",
@@ -24,6 +27,18 @@ router = APIRouter(
 )
 
 
+def get_sync_use_case(db: Session = Depends(get_db)) -> AccountUseCase:
+    return AccountUseCase(db)
+
+
+def get_async_use_case(db: AsyncSession = Depends(get_async_db)) -> AsyncAccountUseCase:
+    return AsyncAccountUseCase(db)
+
+
+# DB_ASYNC define qual sessão (Session ou AsyncSession) os endpoints usam
+get_use_case = get_async_use_case if DB_ASYNC else get_sync_use_case
+
+
 @router.post(
     "/register",
     response_model=AccountResponse,
@@ -32,7 +47,7 @@ router = APIRouter(
 )
 async def register(
     data: AccountCreate, 
-    db: Session = Depends(get_db)
+    use_case: AccountUseCase = Depends(get_use_case)
 ):
     """
     Registrar novo usuário
@@ -42,7 +57,6 @@ async def register(
     - password: Senha para acesso
     """
     try:
-        use_case = AccountUseCase(db)
         account = await use_case.register(data=data)
         return account
     except HTTPException as http_exc:
@@ -59,7 +73,7 @@ async def register(
 )
 async def login(
     data: AccountLogin,
-    db: Session = Depends(get_db)
+    use_case: AccountUseCase = Depends(get_use_case)
 ):
     """
     Autenticar usuário e retornar tokens de acesso e refresh.
@@ -68,10 +82,12 @@ async def login(
     - password: Senha do usuário
     """
     try:
-        use_case = AccountUseCase(db)
         token_response = await use_case.login(data=data)
         return token_response
     
+    except HTTPException as http_exc:
+        # 401/404 de credenciais e 503 do pool de hash não devem virar 500
+        raise http_exc
     except Exception as e:
         raise exception_500_INTERNAL_SERVER_ERROR(
             f"Erro interno ao fazer login: {str(e)}"
@@ -85,7 +101,7 @@ async def login(
 )
 async def refresh_token(
     data: RefreshTokenRequest,
-    db: Session = Depends(get_db)
+    use_case: AccountUseCase = Depends(get_use_case)
 ):
     """
     Gerar novo token de acesso usando refresh token.
@@ -93,10 +109,12 @@ async def refresh_token(
     - refresh_token: Refresh token válido obtido no login (deve ser enviado no body)
     """
     try:
-        use_case = AccountUseCase(db)
         refresh_response = await use_case.refresh_token(data=data)
         return refresh_response
     
+    except HTTPException as http_exc:
+        # 401/404 de credenciais e 503 do pool de hash não devem virar 500
+        raise http_exc
     except Exception as e:
         raise exception_500_INTERNAL_SERVER_ERROR(
             f"Erro interno ao renovar token: {str(e)}"
@@ -109,19 +127,27 @@ async def refresh_token(
     summary="Obter perfil do usuário autenticado"
 )
 async def get_me(
+    request: Request,
     current_user: User = Depends(get_current_user),
 ):
     """
     Obter perfil do usuário autenticado.
+    
+    - ETag forte (id + updated_at) e Last-Modified; If-None-Match/If-Modified-Since respondem 304
     """
     try:
+        etag = strong_etag(current_user.id, current_user.updated_at)
+        if is_not_modified(request, etag, current_user.updated_at):
+            return not_modified(etag, current_user.updated_at)
+
         # Converter User para AccountResponse
-        from api.v1._shared.schemas import AccountResponse
-        
-        return AccountResponse.model_validate({
+        account = AccountResponse.model_validate({
             **current_user.__dict__,
             "permissions": current_user.permissions or []
         })
+        return set_validators(
+            FastJSONResponse(account.model_dump()), etag, current_user.updated_at
+        )
     
     except Exception as e:
         raise exception_500_INTERNAL_SERVER_ERROR(
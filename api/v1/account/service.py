@@ -6,6 +6,7 @@ from decouple import config
 
 from fastapi import HTTPException, status
 from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from api.utils.exceptions import (
@@ -25,7 +26,7 @@ from api.v1._shared.schemas import (
     TokenResponse,
     RefreshTokenResponse,
 )
-from api.v1.user.service import UserService
+from api.v1.user.service import AsyncUserService, UserService
 
 ACCESS_TOKEN_EXPIRE_MINUTES = int(config("ACCESS_TOKEN_EXPIRE_MINUTES"))
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -38,7 +39,7 @@ class AccountService:
     def __init__(self, db: Session):
         self.user_service = UserService(db)
         
-    def register(self, data: UserCreate) -> AccountResponse:
+    async def register(self, data: UserCreate) -> AccountResponse:
         """
         Registrar nova conta.
         
@@ -49,10 +50,10 @@ class AccountService:
             A conta criada
         """
         # UserService.create() já valida se o email existe
-        user = self.user_service.create(data)
+        user = await self.user_service.create(data)
         return user
 
-    def login(self, data: AccountLogin) -> TokenResponse:
+    async def login(self, data: AccountLogin) -> TokenResponse:
         """
         Autenticar usuário e gerar tokens.
         
@@ -62,15 +63,22 @@ class AccountService:
         Returns:
             TokenResponse
         """
-        user = self.user_service.get_user_by_email(data.email, data.password)
-        
-        # Povoar dados do token
-        token_data = {
+        user = await self.user_service.get_user_by_email(data.email, data.password)
+        return self._login_tokens(user)
+
+    def _token_data(self, user) -> Dict[str, Any]:
+        # permissions vai no token para a autenticação stateless (get_current_principal)
+        return {
             "sub": str(user.id), 
             "email": user.email,
-            "name": user.name
+            "name": user.name,
+            "permissions": list(user.permissions or [])
         }
 
+    def _login_tokens(self, user) -> TokenResponse:
+        # Povoar dados do token
+        token_data = self._token_data(user)
+
         # Gerar tokens
         access_token = create_access_token(token_data)
         refresh_token = create_refresh_token(token_data)
@@ -93,16 +101,14 @@ class AccountService:
         user_id = payload.get("sub") 
 
         user = self.user_service.get(UUID(user_id))
+        return self._refresh_tokens(user)
 
+    def _refresh_tokens(self, user) -> RefreshTokenResponse:
         if not user:
             raise exception_401_UNAUTHORIZED(detail="Token inválido")
 
         # Povoar dados do token
-        token_data = {
-            "sub": str(user.id), 
-            "email": user.email,
-            "name": user.name
-        }
+        token_data = self._token_data(user)
 
         # Gerar novos tokens
         access_token = create_access_token(token_data)
@@ -114,4 +120,17 @@ class AccountService:
             token_type="bearer",
             expires_in=int(ACCESS_TOKEN_EXPIRE_MINUTES) * 60,
         )
-    
\ No newline at end of file
+
+
+class AsyncAccountService(AccountService):
+    """AccountService sobre o AsyncUserService (caminho DB_ASYNC)."""
+
+    def __init__(self, db: AsyncSession):
+        self.user_service = AsyncUserService(db)
+
+    async def refresh_token(self, refresh_token: str) -> RefreshTokenResponse:
+        payload = verify_refresh_token(refresh_token)
+        user_id = payload.get("sub")
+
+        user = await self.user_service.get(UUID(user_id))
+        return self._refresh_tokens(user)
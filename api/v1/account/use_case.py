@@ -1,4 +1,5 @@
 from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
@@ -11,24 +12,34 @@ from api.v1._shared.schemas import (
     RefreshTokenResponse,
     UserCreate,
 )
-from api.v1.account.service import AccountService
+from api.v1.account.service import AccountService, AsyncAccountService
 
 class AccountUseCase:
     
     def __init__(self, db: Session):
         self.service = AccountService(db)
     
-    async def register(self, data: AccountCreate) -> AccountResponse:
+    def _user_data(self, data: AccountCreate) -> UserCreate:
         # adiciona permissao USER ao usuário criado
-        user_data = UserCreate.model_validate({
+        return UserCreate.model_validate({
             **data.__dict__,
             "permissions": ["USER"]
         })
-        return self.service.register(user_data)
+
+    async def register(self, data: AccountCreate) -> AccountResponse:
+        return await self.service.register(self._user_data(data))
     
     async def login(self, data: AccountLogin) -> TokenResponse:
-        return self.service.login(data)
+        return await self.service.login(data)
     
     async def refresh_token(self, data: RefreshTokenRequest) -> RefreshTokenResponse:
         return self.service.refresh_token(data.refresh_token)
-    
\ No newline at end of file
+
+
+class AsyncAccountUseCase(AccountUseCase):
+
+    def __init__(self, db: AsyncSession):
+        self.service = AsyncAccountService(db)
+
+    async def refresh_token(self, data: RefreshTokenRequest) -> RefreshTokenResponse:
+        return await self.service.refresh_token(data.refresh_token)
@@ -1,15 +1,35 @@
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, Query, Request
+from decouple import config
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from api.utils.db_filter import parse_filter_params
-from api.utils.db_services import get_db
-from api.utils.security import get_current_user
+from api.utils.conditional import is_not_modified, not_modified, set_validators, strong_etag
+from api.utils.counting import CountMode
+from api.utils.db_filter import parse_fields, parse_filter_params
+from api.utils.db_services import AsyncSessionLocal, DB_ASYNC, SessionLocal, get_async_db, get_db
+from api.utils.export import MEDIA_TYPES, ExportFormat, aiter_export, iter_export
+from api.utils.list_cache import LIST_CACHE_ENABLED, list_cache, list_cache_key
+from api.utils.responses import FastJSONResponse
+from api.utils.single_flight import coalesce
+from api.utils.exceptions import exception_400_BAD_REQUEST
+from api.utils.security import STATELESS_AUTH, get_current_admin, get_current_principal, get_current_user
 from api.v1._shared.models import User
-from api.v1._shared.schemas import UserCreate, UserDelete, UserResponse, UserUpdate
-from api.v1.user.use_case import UserUseCase
+from api.v1._shared.schemas import (
+    UserBatchDelete,
+    UserBatchGet,
+    UserBatchGetResult,
+    UserBatchReport,
+    UserCreate,
+    UserDelete,
+    UserImportReport,
+    UserResponse,
+    UserUpdate,
+)
+from api.v1.user.use_case import AsyncUserUseCase, UserUseCase
 
 
 router = APIRouter(
@@ -18,6 +38,27 @@ router = APIRouter(
 )
 
 filter_fields = ["name", "email"]
+response_fields = [field for field in UserResponse.model_fields]
+EXPORT_BATCH_SIZE = config("EXPORT_BATCH_SIZE", default=1000, cast=int)
+# Cada linha gera um hash bcrypt na mesma requisição (~0,2s de CPU por linha no pool)
+IMPORT_MAX_ROWS = config("IMPORT_MAX_ROWS", default=1000, cast=int)
+BATCH_MAX_ITEMS = config("BATCH_MAX_ITEMS", default=1000, cast=int)
+BATCH_GET_MAX_IDS = config("BATCH_GET_MAX_IDS", default=500, cast=int)
+
+
+def get_sync_use_case(db: Session = Depends(get_db)) -> UserUseCase:
+    return UserUseCase(db)
+
+
+def get_async_use_case(db: AsyncSession = Depends(get_async_db)) -> AsyncUserUseCase:
+    return AsyncUserUseCase(db)
+
+
+# DB_ASYNC define qual sessão (Session ou AsyncSession) os endpoints usam
+get_use_case = get_async_use_case if DB_ASYNC else get_sync_use_case
+
+# Leituras só precisam da identidade: com STATELESS_AUTH=True não consultam o usuário no banco
+get_reader = get_current_principal if STATELESS_AUTH else get_current_user
 
 
 @router.get("", response_model=List[UserResponse])
@@ -28,8 +69,11 @@ async def list(
     sort_by: Optional[str] = Query(None, description="Campo para ordenação"),
     sort_dir: str = Query("asc", regex="^(asc|desc)$", description="Direção da ordenação (asc ou desc)"),
     search: Optional[str] = Query(None, description="Busca textual nos campos padrões (name, email)"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor da resposta anterior)"),
+    fields: Optional[str] = Query(None, description="Campos a retornar separados por vírgula (ex: id,name)"),
+    count: Optional[CountMode] = Query(None, description="Total no header X-Total-Count: exact ou estimate"),
+    current_user: User = Depends(get_reader),
+    use_case: UserUseCase = Depends(get_use_case)
 ) -> List[UserResponse]:
     """
     Listar usuários
@@ -39,68 +83,258 @@ async def list(
     - sort_by: Campo para ordenação
     - sort_dir: Direção da ordenação - "asc" ou "desc"
     - search: Busca textual nos campos padrões
+    - cursor: Paginação por cursor (keyset). Envie o valor do header X-Next-Cursor
+      da página anterior, mantendo os mesmos sort_by/sort_dir/filtros e sem skip
+    - fields: Retorna só os campos informados (ex: fields=id,name)
+      Campos válidos: id, name, email, permissions, created_at, updated_at
+    - count: Retorna o total no header X-Total-Count
+        - exact: COUNT(*) com os mesmos filtros (em cache por alguns segundos)
+        - estimate: estimativa do planner do PostgreSQL (barata, aproximada)
     - Filtros via URL: Use formato campo[operador]=valor
         - Ex: name[eq]=Jose ou name[contains]=Jo
         - Operadores válidos: eq, ne, contains
         - Campos válidos: name, email
+    - ETag fraco da página: com If-None-Match igual responde 304 sem corpo
+    - Páginas ficam em cache (já serializadas) até a próxima escrita em usuários
     """
     # envio o request.query_params caso tenha filtros válidos preenche o filter_conditions
     # estou deixando o known_params dessa forma pois no futuro posso adicionar mais parâmetros
     filter_conditions = parse_filter_params(
         dict(request.query_params), 
         filter_fields,
-        known_params=["skip", "limit", "sort_by", "sort_dir", "search"]
+        known_params=["skip", "limit", "sort_by", "sort_dir", "search", "cursor", "fields", "count"]
     )
-    
-    use_case = UserUseCase(db)
-    return use_case.list(
+    selected_fields = parse_fields(fields, response_fields)
+
+    cache_key = list_cache_key(
+        "user", skip, limit, sort_by, sort_dir, search, filter_conditions, cursor, selected_fields, count
+    )
+    cached = list_cache.get(cache_key) if LIST_CACHE_ENABLED else None
+    if cached is not None:
+        body, headers = cached
+        if is_not_modified(request, headers["ETag"]):
+            return _page_not_modified(headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    # Geração lida antes da consulta: se houver escrita no meio, a página não entra no cache
+    generation = list_cache.generation
+
+    # Leitura projetada: linhas Core serializadas direto, sem ORM nem validação por item.
+    # Requisições idênticas simultâneas (mesma chave e geração) compartilham uma consulta.
+    users, cursor_next, etag = await coalesce(("list", generation, cache_key), lambda: use_case.list_rows(
         skip=skip,
         limit=limit,
         sort_by=sort_by,
         sort_dir=sort_dir,
         search=search,
-        filter_conditions=filter_conditions
+        filter_conditions=filter_conditions,
+        cursor=cursor,
+        fields=selected_fields
+    ))
+
+    headers = {"ETag": etag}
+    # Página cheia: informa o cursor para buscar a próxima sem offset
+    if cursor_next:
+        headers["X-Next-Cursor"] = cursor_next
+
+    # Página igual à do cliente: 304 sem serializar (e sem a contagem)
+    if is_not_modified(request, etag):
+        return _page_not_modified(headers)
+
+    if count:
+        total = await use_case.count(search, filter_conditions, count)
+        headers["X-Total-Count"] = str(total)
+
+    response = FastJSONResponse(users, headers=headers)
+    if LIST_CACHE_ENABLED:
+        list_cache.set(cache_key, response.body, headers, generation)
+    return response
+
+
+def _page_not_modified(headers: Dict[str, str]) -> Response:
+    response = not_modified(headers["ETag"])
+    if "X-Next-Cursor" in headers:
+        response.headers["X-Next-Cursor"] = headers["X-Next-Cursor"]
+    return response
+
+
+def _export_sync(query: Any, export_format: ExportFormat):
+    # Sessão própria: vive enquanto a resposta é transmitida (roda no threadpool do Starlette)
+    with SessionLocal() as db:
+        yield from iter_export(UserUseCase(db).stream_batches(query), export_format, response_fields)
+
+
+async def _export_async(query: Any, export_format: ExportFormat):
+    async with AsyncSessionLocal() as db:
+        async for chunk in aiter_export(AsyncUserUseCase(db).stream_batches(query), export_format, response_fields):
+            yield chunk
+
+
+@router.get("/export")
+async def export(
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="Formato: ndjson ou csv"),
+    search: Optional[str] = Query(None, description="Busca textual nos campos padrões (name, email)"),
+    current_user: User = Depends(get_current_user),
+    use_case: UserUseCase = Depends(get_use_case)
+) -> StreamingResponse:
+    """
+    Exportar usuários em streaming (NDJSON ou CSV)
+    
+    - format: ndjson (padrão) ou csv
+    - search e filtros via URL: os mesmos da listagem (campo[operador]=valor)
+    
+    Lê com cursor no servidor em lotes, então a memória não cresce com o total de linhas.
+    """
+    filter_conditions = parse_filter_params(
+        dict(request.query_params),
+        filter_fields,
+        known_params=["format", "search"]
+    )
+    query = use_case.export_statement(search, filter_conditions, EXPORT_BATCH_SIZE)
+
+    content = _export_async(query, format) if DB_ASYNC else _export_sync(query, format)
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format.value}"'}
     )
 
 
+@router.post("/batch-get", response_model=List[UserBatchGetResult])
+async def get_many(
+    batch: UserBatchGet,
+    fields: Optional[str] = Query(None, description="Campos a retornar separados por vírgula (ex: id,name)"),
+    current_user: User = Depends(get_reader),
+    use_case: UserUseCase = Depends(get_use_case)
+) -> List[UserBatchGetResult]:
+    """
+    Buscar vários usuários por ID em uma única consulta
+    
+    - Corpo: {"ids": [...]} (máximo BATCH_GET_MAX_IDS)
+    - Retorna um item por ID, na mesma ordem: {"id", "found", "user"}
+    - IDs inexistentes ou excluídos voltam com found=false e user=null
+    - fields: mesmo comportamento do GET /users/{id}
+    """
+    if len(batch.ids) > BATCH_GET_MAX_IDS:
+        raise exception_400_BAD_REQUEST(detail=f"Máximo de {BATCH_GET_MAX_IDS} IDs por requisição")
+    selected_fields = parse_fields(fields, response_fields)
+    return FastJSONResponse(await use_case.get_rows(batch.ids, selected_fields))
+
+
 @router.get("/{id}", response_model=UserResponse)
 async def get_by_id(
+    request: Request,
     id: UUID = Path(..., description="ID do usuário"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="Campos a retornar separados por vírgula (ex: id,name)"),
+    current_user: User = Depends(get_reader),
+    use_case: UserUseCase = Depends(get_use_case)
 ) -> UserResponse:
-    use_case = UserUseCase(db)
-    return use_case.get(id)
+    """
+    Buscar usuário por ID
+    
+    - ETag forte (id + updated_at) e Last-Modified; If-None-Match/If-Modified-Since respondem 304
+    """
+    selected_fields = parse_fields(fields, response_fields)
+    # Geração na chave: quem chega depois de uma escrita não reaproveita uma leitura anterior a ela
+    row, updated_at = await coalesce(
+        ("get", list_cache.generation, id, tuple(selected_fields or ())),
+        lambda: use_case.get_row(id, selected_fields)
+    )
+
+    etag = strong_etag(id, updated_at, selected_fields)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at)
+    return set_validators(FastJSONResponse(row), etag, updated_at)
 
 """
 @router.post("", response_model=UserResponse, status_code=201)
 async def create(
     User: UserCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    use_case: UserUseCase = Depends(get_use_case)
 ) -> UserResponse:
-    use_case = UserUseCase(db)
-    return use_case.create(User)
+    return await use_case.create(User)
 """
 
 
+@router.post("/import", response_model=UserImportReport)
+async def import_users(
+    request: Request,
+    current_user: User = Depends(get_current_admin),
+    use_case: UserUseCase = Depends(get_use_case)
+) -> UserImportReport:
+    """
+    Importar usuários em lote (somente ADMIN)
+    
+    - Corpo em NDJSON: uma linha por usuário {"name", "email", "password", "permissions"?}
+    - permissions padrão: ["USER"]
+    - Retorna o resultado por linha: created, duplicate ou invalid
+    - Máximo de IMPORT_MAX_ROWS linhas: cargas maiores devem ser divididas em várias requisições
+    """
+    lines = (await request.body()).splitlines()
+    if len(lines) > IMPORT_MAX_ROWS:
+        raise exception_400_BAD_REQUEST(
+            detail=f"Máximo de {IMPORT_MAX_ROWS} linhas por importação"
+        )
+    return await use_case.import_users(lines)
+
+
 @router.put("", response_model=UserResponse)
 async def update(
     User: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    use_case: UserUseCase = Depends(get_use_case)
 ) -> UserResponse:
-    use_case = UserUseCase(db)
-    return use_case.update(User)
+    return await use_case.update(User)
 
 
 @router.delete("", response_model=UserResponse)
 async def delete(
     User: UserDelete,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    use_case: UserUseCase = Depends(get_use_case)
 ) -> UserResponse:
     # Deleta um usuário validando senha
     
-    use_case = UserUseCase(db)
-    return use_case.delete(User)
\ No newline at end of file
+    return await use_case.delete(User)
+
+
+def _check_batch_size(size: int) -> None:
+    if size == 0:
+        raise exception_400_BAD_REQUEST(detail="Lote vazio")
+    if size > BATCH_MAX_ITEMS:
+        raise exception_400_BAD_REQUEST(detail=f"Máximo de {BATCH_MAX_ITEMS} itens por lote")
+
+
+@router.put("/batch", response_model=UserBatchReport)
+async def update_many(
+    items: List[UserUpdate],
+    current_user: User = Depends(get_current_admin),
+    use_case: UserUseCase = Depends(get_use_case)
+) -> UserBatchReport:
+    """
+    Atualizar usuários em lote (somente ADMIN)
+    
+    - Corpo: lista de objetos no formato do PUT /users
+    - Tudo em uma transação, com um único UPDATE
+    - Resultado por item (na ordem enviada): updated, not_found, duplicate ou invalid
+    """
+    _check_batch_size(len(items))
+    return await use_case.update_many(items)
+
+
+@router.delete("/batch", response_model=UserBatchReport)
+async def delete_many(
+    batch: UserBatchDelete,
+    current_user: User = Depends(get_current_admin),
+    use_case: UserUseCase = Depends(get_use_case)
+) -> UserBatchReport:
+    """
+    Excluir (soft delete) usuários em lote (somente ADMIN)
+    
+    - Corpo: {"ids": [...]}
+    - Resultado por item (na ordem enviada): deleted, not_found ou invalid
+    """
+    _check_batch_size(len(batch.ids))
+    return await use_case.delete_many(batch.ids)
@@ -1,19 +1,54 @@
-from api.v1._shared.schemas import UserCreate, UserUpdate, UserResponse, UserDelete
-from api.v1._shared.models import User
-from typing import List, Optional
-from uuid import UUID
+from api.v1._shared.schemas import (
+    UserCreate,
+    UserUpdate,
+    UserResponse,
+    UserDelete,
+    UserBatchReport,
+    UserBatchResult,
+    UserImport,
+    UserImportReport,
+    UserImportResult,
+)
+from api.v1._shared.models import User, tz
+import csv
+from datetime import datetime
+import io
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID, uuid4
+from pydantic import ValidationError
+from sqlalchemy import ARRAY, String, any_, bindparam, cast, column, func, select, text, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from api.utils.db_filter import (
-    validate_sort_field, 
-    build_search_filter, 
+    validate_sort_field,
+    build_search_filter,
     build_query_filter,
-    FilterCondition
+    FilterCondition,
+    iequals_filter
+)
+from api.utils.conditional import weak_etag
+from api.utils.counting import (
+    RELTUPLES_SQL,
+    CountMode,
+    count_cache,
+    count_cache_key,
+    explain_statement,
+    plan_rows
+)
+from api.utils.list_cache import list_cache
+from api.utils.pagination import build_keyset_filter, decode_cursor, next_cursor
+from api.utils.security import (
+    get_password_hash_async,
+    get_password_hashes_async,
+    invalidate_principal,
+    verify_password_async
 )
-from api.utils.security import get_password_hash, verify_password
 from api.utils.exceptions import exception_404_NOT_FOUND, exception_400_BAD_REQUEST, exception_401_UNAUTHORIZED
 
-# Utilizo essa estratégia para gerar novos arquivos services 
+# Utilizo essa estratégia para gerar novos arquivos services
 # trocando apenas o nome do arquivo e o objeto que será usado.
 CreateType = UserCreate
 UpdateType = UserUpdate
@@ -23,11 +58,57 @@ ObjectType = User
 
 filter_fields = ["name", "email"]
 sort_fields = ["name", "email"]
+# Colunas do ResponseType: leituras rápidas selecionam só elas (sem password e sem ORM)
+response_columns = [getattr(ObjectType, field) for field in ResponseType.model_fields]
 
-class UserService:
+# Importação em lote: COPY para uma tabela temporária + um único INSERT ... SELECT
+IMPORT_STAGING_TABLE = "user_import_staging"
+IMPORT_COLUMNS = ["line", "id", "name", "email", "password", "permissions", "created_at", "updated_at"]
+IMPORT_STAGING_DDL = text(f"""
+    CREATE TEMP TABLE {IMPORT_STAGING_TABLE} (
+        line integer NOT NULL,
+        id uuid NOT NULL,
+        name varchar(255) NOT NULL,
+        email varchar(255) NOT NULL,
+        password varchar(255) NOT NULL,
+        permissions varchar[] NOT NULL,
+        created_at timestamptz NOT NULL,
+        updated_at timestamptz NOT NULL
+    ) ON COMMIT DROP
+""")
+IMPORT_COPY_SQL = f"COPY {IMPORT_STAGING_TABLE} ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+# Emails repetidos no arquivo: vale a primeira linha. Emails já cadastrados (mesmo excluídos,
+# pois o índice único cobre todos) são ignorados; ON CONFLICT sem alvo cobre inserções
+# concorrentes nos dois índices únicos (email e lower(email)).
+IMPORT_INSERT_SQL = text(f"""
+    INSERT INTO "user" (id, name, email, password, permissions, created_at, updated_at, flg_deleted)
+    SELECT id, name, email, password, permissions, created_at, updated_at, false
+    FROM (
+        SELECT DISTINCT ON (lower(s.email)) s.*
+        FROM {IMPORT_STAGING_TABLE} s
+        ORDER BY lower(s.email), s.line
+    ) AS staged
+    WHERE NOT EXISTS (SELECT 1 FROM "user" u WHERE lower(u.email) = lower(staged.email))
+    ON CONFLICT DO NOTHING
+    RETURNING id
+""")
 
-    def __init__(self, db: Session):
-        self.db = db
+
+# Atualização em lote: colunas do VALUES (NULL = manter o valor atual)
+BATCH_UPDATE_COLUMNS = {
+    "id": PG_UUID(as_uuid=True),
+    "name": String(255),
+    "email": String(255),
+    "password": String(255),
+    "permissions": ARRAY(String),
+}
+
+
+class BaseUserService:
+    """
+    Monta as queries (select) usadas pelos serviços síncrono e assíncrono.
+    As subclasses só executam os statements na sessão correspondente.
+    """
 
     def _to_response(self, user: ObjectType) -> ResponseType:
         """Converte objeto User para UsuarioResponse usando spread"""
@@ -36,168 +117,959 @@ class UserService:
             "permissions": user.permissions or []
         })
 
-    def list(
+    def _row_to_dict(self, row: Any, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Converte uma linha (Core) em dict no formato do ResponseType, sem validação"""
+        data = dict(row._mapping)
+        if "permissions" in data:
+            data["permissions"] = data["permissions"] or []
+        if fields:
+            return {field: data[field] for field in fields}
+        return data
+
+    def _projection(self, fields: Optional[List[str]], extra: Optional[List[Any]] = None) -> List[Any]:
+        """Colunas a selecionar: as pedidas em fields (ou todas da resposta) + extras (ex: ordenação)"""
+        if not fields:
+            return response_columns
+        columns = [getattr(ObjectType, field) for field in fields]
+        for column in extra or []:
+            if column.key not in fields:
+                columns.append(column)
+        return columns
+
+    def _where_clauses(
         self,
-        skip: int = 0,
-        limit: int = 10,
-        sort_by: Optional[str] = None,
-        sort_dir: str = "asc",
         search: Optional[str] = None,
         filter_conditions: Optional[List[FilterCondition]] = None
-    ) -> List[ResponseType]:
-        # Listagem com paginação, ordenação e filtros
-        query = self.db.query(ObjectType).filter(ObjectType.flg_deleted == False)
+    ) -> List[Any]:
+        # Predicados compartilhados pela listagem e pela contagem
+        clauses = [ObjectType.flg_deleted == False]
 
         # Aplicar filtros (preferência por search)
         if search:
-            query = query.filter(build_search_filter(search, ObjectType, filter_fields))
+            clauses.append(build_search_filter(search, ObjectType, filter_fields))
         elif filter_conditions:
             filter_result = build_query_filter(filter_conditions, ObjectType, filter_fields)
             if filter_result is not None:
-                query = query.filter(filter_result)
+                clauses.append(filter_result)
+        return clauses
 
-        # Validar e aplicar ordenação
+    def _sort_columns(self, sort_by: Optional[str] = None, sort_dir: str = "asc"):
+        # Ordenação sempre termina no id para desempate (estável para offset e keyset)
         if sort_by:
             # Aqui eu valido e se tiver erro eu gero uma Exception
             validate_sort_field(sort_by, sort_fields, "usuário")
-            column = getattr(ObjectType, sort_by)
-            if sort_dir.lower() == "desc":
-                query = query.order_by(column.desc())
+            desc = sort_dir.lower() == "desc"
+            return [(getattr(ObjectType, sort_by), desc), (ObjectType.id, desc)]
+        # Ordenação padrão por created_at desc
+        return [(ObjectType.created_at, True), (ObjectType.id, True)]
+
+    def _list_statement(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        sort_by: Optional[str] = None,
+        sort_dir: str = "asc",
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        cursor: Optional[str] = None,
+        columns: Optional[List[Any]] = None
+    ):
+        # Listagem com paginação, ordenação e filtros
+        # columns: projeção em colunas (linhas Core); None carrega a entidade completa
+        query = select(*columns) if columns else select(ObjectType)
+        query = query.where(*self._where_clauses(search, filter_conditions))
+
+        # Validar e aplicar ordenação
+        sort_columns = self._sort_columns(sort_by, sort_dir)
+        query = query.order_by(*[
+            column.desc() if desc else column.asc() for column, desc in sort_columns
+        ])
+
+        # Paginação por cursor (keyset): continua a partir do último item da página anterior
+        if cursor:
+            if skip:
+                raise exception_400_BAD_REQUEST(detail="Use skip ou cursor, não os dois")
+            values = decode_cursor(cursor, sort_columns)
+            return query.where(build_keyset_filter(sort_columns, values)).limit(limit)
+
+        # Aplicar paginação por offset (mantida por compatibilidade)
+        return query.offset(skip).limit(limit)
+
+    def _list_rows_statement(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        sort_by: Optional[str] = None,
+        sort_dir: str = "asc",
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ):
+        # As colunas de ordenação sempre entram no select para gerar o próximo cursor;
+        # updated_at (com o id, já presente na ordenação) para o ETag da página
+        sort_columns = self._sort_columns(sort_by, sort_dir)
+        columns = self._projection(
+            fields, extra=[column for column, _ in sort_columns] + [ObjectType.updated_at]
+        )
+        query = self._list_statement(
+            skip, limit, sort_by, sort_dir, search, filter_conditions, cursor, columns=columns
+        )
+        return query, sort_columns
+
+    def _page(
+        self,
+        rows: List[Dict[str, Any]],
+        limit: int,
+        sort_columns: List[Any],
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], str]:
+        cursor = next_cursor(rows, limit, sort_columns)
+        etag = weak_etag([(row["id"], row["updated_at"]) for row in rows], fields)
+        if fields:
+            rows = [{field: row[field] for field in fields} for row in rows]
+        return rows, cursor, etag
+
+    def _export_statement(
+        self,
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        batch_size: int = 1000
+    ):
+        # Sem ORDER BY: a exportação completa não precisa de ordem e evita sort no banco.
+        # yield_per ativa cursor no servidor (stream_results), a memória fica constante.
+        return select(*response_columns).where(
+            *self._where_clauses(search, filter_conditions)
+        ).execution_options(yield_per=batch_size)
+
+    def _count_statement(
+        self,
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None
+    ):
+        # COUNT(*) com os mesmos predicados da listagem
+        return select(func.count()).select_from(ObjectType).where(
+            *self._where_clauses(search, filter_conditions)
+        )
+
+    def _estimate_statement(
+        self,
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None
+    ):
+        # Statement só para o EXPLAIN: o planner estima as linhas sem executar
+        return select(ObjectType.id).where(*self._where_clauses(search, filter_conditions))
+
+    def _count_key(
+        self,
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None
+    ):
+        return count_cache_key(ObjectType.__tablename__, search, filter_conditions)
+
+    def _by_id_statement(self, id: UUID, columns: Optional[List[Any]] = None):
+        query = select(*columns) if columns else select(ObjectType)
+        return query.where(
+            ObjectType.id == id,
+            ObjectType.flg_deleted == False
+        )
+
+    def _by_email_statement(self, email: str, exclude_id: Optional[UUID] = None):
+        # lower(email) = lower(:email) usa o índice único ix_user_email_lower_unique
+        query = select(ObjectType).where(
+            iequals_filter(ObjectType.email, email),
+            ObjectType.flg_deleted == False
+        )
+        if exclude_id is not None:
+            query = query.where(ObjectType.id != exclude_id)
+        return query
+
+    def _ids_clause(self, ids: List[UUID]):
+        # id = ANY(:ids): um único parâmetro array, o statement não muda com a quantidade de ids
+        return ObjectType.id == any_(bindparam("ids", ids, type_=ARRAY(PG_UUID(as_uuid=True))))
+
+    def _by_ids_statement(self, ids: List[UUID], columns: List[Any]):
+        return select(*columns).where(self._ids_clause(ids), ObjectType.flg_deleted == False)
+
+    def _batch_get_results(
+        self,
+        ids: List[UUID],
+        rows: Dict[UUID, Dict[str, Any]],
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Um item por id, na ordem pedida (repetidos inclusive); ausentes/excluídos com found=false"""
+        results = []
+        for id in ids:
+            row = rows.get(id)
+            results.append({
+                "id": id,
+                "found": row is not None,
+                "user": {field: row[field] for field in fields} if row is not None and fields else row
+            })
+        return results
+
+    def _existing_ids_statement(self, ids: List[UUID]):
+        return select(ObjectType.id).where(self._ids_clause(ids), ObjectType.flg_deleted == False)
+
+    def _email_owners_statement(self, emails: List[str]):
+        """
+        Para cada email do lote: lower(email) calculado pelo PostgreSQL (mesma regra do índice
+        único) e o id do dono atual, se houver. Considera também os excluídos (o índice cobre todas).
+        """
+        # render_derived: "AS batch(email)" (sem a lista, a coluna do unnest se chamaria batch)
+        batch = func.unnest(bindparam("emails", emails, type_=ARRAY(String))).table_valued(
+            "email"
+        ).render_derived(name="batch")
+        return select(
+            batch.c.email,
+            func.lower(batch.c.email).label("lowered"),
+            ObjectType.id,
+        ).select_from(batch).outerjoin(ObjectType, func.lower(ObjectType.email) == func.lower(batch.c.email))
+
+    def _email_keys(self, rows: List[Any]) -> Tuple[Dict[str, str], Dict[str, UUID]]:
+        """(email -> lower do banco, lower do banco -> id do dono) a partir do _email_owners_statement"""
+        lowered = {row.email: row.lowered for row in rows}
+        owners = {row.lowered: row.id for row in rows if row.id is not None}
+        return lowered, owners
+
+    def _validate_batch_update(
+        self,
+        items: List[UpdateType],
+        lowered: Dict[str, str]
+    ) -> Tuple[List[Tuple[int, UpdateType]], List[UserBatchResult]]:
+        """Ids e emails repetidos dentro do próprio lote (emails comparados pelo lower do banco)"""
+        valid: List[Tuple[int, UpdateType]] = []
+        errors: List[UserBatchResult] = []
+        seen_ids = set()
+        seen_emails = set()
+        for index, item in enumerate(items):
+            email = lowered[item.email] if item.email else None
+            if item.id in seen_ids:
+                errors.append(UserBatchResult(
+                    index=index, id=item.id, status="invalid", error="ID repetido no lote"
+                ))
+            elif email and email in seen_emails:
+                errors.append(UserBatchResult(
+                    index=index, id=item.id, status="duplicate", error=f"Email {item.email} repetido no lote"
+                ))
+            else:
+                valid.append((index, item))
+            seen_ids.add(item.id)
+            if email:
+                seen_emails.add(email)
+        return valid, errors
+
+    def _check_batch_update(
+        self,
+        valid: List[Tuple[int, UpdateType]],
+        existing_ids: set,
+        lowered: Dict[str, str],
+        email_owners: Dict[str, UUID]
+    ) -> Tuple[List[Tuple[int, UpdateType]], List[UserBatchResult]]:
+        """Confere o lote contra o banco: usuários inexistentes e emails de outros usuários"""
+        ready: List[Tuple[int, UpdateType]] = []
+        errors: List[UserBatchResult] = []
+        for index, item in valid:
+            if item.id not in existing_ids:
+                errors.append(UserBatchResult(
+                    index=index, id=item.id, status="not_found",
+                    error=f"Usuário com ID {item.id} não encontrado"
+                ))
+            elif item.email and email_owners.get(lowered[item.email], item.id) != item.id:
+                errors.append(UserBatchResult(
+                    index=index, id=item.id, status="duplicate", error=f"Email {item.email} já está em uso"
+                ))
+            else:
+                ready.append((index, item))
+        return ready, errors
+
+    def _batch_update_statement(
+        self,
+        ready: List[Tuple[int, UpdateType]],
+        hashed_passwords: List[Optional[str]]
+    ):
+        """
+        Um único UPDATE ... FROM (VALUES ...) para o lote inteiro.
+        Os casts explícitos evitam que o PostgreSQL infira text para colunas só com NULL.
+        """
+        batch = values(
+            *[column(name, type_) for name, type_ in BATCH_UPDATE_COLUMNS.items()],
+            name="batch"
+        ).data([
+            (item.id, item.name, item.email, hashed, item.permissions)
+            for (_, item), hashed in zip(ready, hashed_passwords)
+        ])
+        typed = {name: cast(batch.c[name], type_) for name, type_ in BATCH_UPDATE_COLUMNS.items()}
+        return update(ObjectType).where(
+            ObjectType.id == typed["id"],
+            ObjectType.flg_deleted == False
+        ).values(
+            name=func.coalesce(typed["name"], ObjectType.name),
+            email=func.coalesce(typed["email"], ObjectType.email),
+            password=func.coalesce(typed["password"], ObjectType.password),
+            permissions=func.coalesce(typed["permissions"], ObjectType.permissions),
+            updated_at=datetime.now(tz)
+        ).returning(*response_columns).execution_options(synchronize_session=False)
+
+    def _batch_delete_statement(self, ids: List[UUID]):
+        # Soft delete em lote; RETURNING devolve só os que estavam ativos
+        return update(ObjectType).where(
+            self._ids_clause(ids),
+            ObjectType.flg_deleted == False
+        ).values(
+            flg_deleted=True,
+            updated_at=datetime.now(tz)
+        ).returning(*response_columns).execution_options(synchronize_session=False)
+
+    def _unique_ids(self, ids: List[UUID]) -> Tuple[List[Tuple[int, UUID]], List[UserBatchResult]]:
+        # (posição no lote, id) da primeira ocorrência de cada id; repetições viram erro
+        unique: List[Tuple[int, UUID]] = []
+        errors: List[UserBatchResult] = []
+        seen = set()
+        for index, id in enumerate(ids):
+            if id in seen:
+                errors.append(UserBatchResult(index=index, id=id, status="invalid", error="ID repetido no lote"))
             else:
-                query = query.order_by(column.asc())
-        else:
-            # Ordenação padrão por created_at desc
-            query = query.order_by(ObjectType.created_at.desc())
+                unique.append((index, id))
+                seen.add(id)
+        return unique, errors
+
+    def _batch_report(
+        self,
+        indexed_ids: List[Tuple[int, UUID]],
+        rows: Dict[UUID, Dict[str, Any]],
+        errors: List[UserBatchResult],
+        status: str
+    ) -> UserBatchReport:
+        """Resultado por item, na ordem do lote; ids sem linha no RETURNING viram not_found"""
+        results = list(errors)
+        for index, id in indexed_ids:
+            if id in rows:
+                results.append(UserBatchResult(index=index, id=id, status=status, user=rows[id]))
+            else:
+                results.append(UserBatchResult(
+                    index=index, id=id, status="not_found", error=f"Usuário com ID {id} não encontrado"
+                ))
+        results.sort(key=lambda result: result.index)
+        succeeded = sum(1 for result in results if result.status == status)
+        return UserBatchReport(
+            total=len(results),
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            results=results
+        )
 
-        # Aplicar paginação
-        users = query.offset(skip).limit(limit).all()
+    async def _batch_hashes(self, ready: List[Tuple[int, UpdateType]]) -> List[Optional[str]]:
+        # Hashes do lote em paralelo no pool; None onde a senha não foi enviada
+        hashed = iter(await get_password_hashes_async([item.password for _, item in ready if item.password]))
+        return [next(hashed) if item.password else None for _, item in ready]
+
+    def _after_write(self, ids: Optional[List[UUID]] = None) -> None:
+        # Chamado após o commit: derruba os principals em cache e invalida as listagens
+        for id in ids or []:
+            invalidate_principal(id)
+        list_cache.bump()
+
+    def _new_object(self, obj: CreateType, hashed_password: str) -> ObjectType:
+        return ObjectType(
+            name=obj.name,
+            email=obj.email,
+            password=hashed_password,
+            permissions=obj.permissions or []
+        )
+
+    def _apply_update(self, user: ObjectType, obj: UpdateType, hashed_password: Optional[str]) -> None:
+        # Atualizar campos se fornecidos usando model_dump (exclui None e id)
+        update_data = obj.model_dump(exclude_none=True, exclude={"id", "password"})
+
+        for field, value in update_data.items():
+            setattr(user, field, value)
+
+        # Password precisa de hash especial (calculado pelo chamador no pool de hash)
+        if hashed_password is not None:
+            user.password = hashed_password
+
+    async def _hash_if_present(self, password: Optional[str]) -> Optional[str]:
+        if password is None:
+            return None
+        return await get_password_hash_async(password)
+
+    def _parse_import_lines(
+        self,
+        lines: List[bytes]
+    ) -> Tuple[List[Tuple[int, UserImport]], List[UserImportResult]]:
+        """Valida cada linha do NDJSON; linhas inválidas já saem com o resultado de erro"""
+        valid: List[Tuple[int, UserImport]] = []
+        errors: List[UserImportResult] = []
+        for number, raw in enumerate(lines, start=1):
+            if not raw.strip():
+                continue
+            try:
+                valid.append((number, UserImport.model_validate(json.loads(raw))))
+            except (ValueError, ValidationError) as e:
+                errors.append(UserImportResult(line=number, status="invalid", error=str(e)))
+        return valid, errors
+
+    def _import_records(
+        self,
+        valid: List[Tuple[int, UserImport]],
+        hashed_passwords: List[str]
+    ) -> List[Tuple[Any, ...]]:
+        now = datetime.now(tz)
+        return [
+            (number, uuid4(), item.name, item.email, hashed, item.permissions, now, now)
+            for (number, item), hashed in zip(valid, hashed_passwords)
+        ]
+
+    def _import_csv(self, records: List[Tuple[Any, ...]]) -> io.StringIO:
+        # Formato CSV do COPY; arrays no formato literal do PostgreSQL ({USER,ADMIN})
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for number, id, name, email, password, permissions, created_at, updated_at in records:
+            writer.writerow([
+                number, id, name, email, password,
+                "{" + ",".join(permissions) + "}",
+                created_at.isoformat(), updated_at.isoformat()
+            ])
+        buffer.seek(0)
+        return buffer
+
+    def _import_report(
+        self,
+        records: List[Tuple[Any, ...]],
+        inserted_ids: set,
+        errors: List[UserImportResult]
+    ) -> UserImportReport:
+        results = list(errors)
+        for number, id, name, email, *_ in records:
+            if id in inserted_ids:
+                results.append(UserImportResult(line=number, status="created", email=email, id=id))
+            else:
+                results.append(UserImportResult(
+                    line=number, status="duplicate", email=email, error=f"Email {email} já está em uso"
+                ))
+        results.sort(key=lambda result: result.line)
+        created = len(inserted_ids)
+        return UserImportReport(
+            total=len(results),
+            created=created,
+            failed=len(results) - created,
+            results=results
+        )
+
+    def _raise_if_duplicate_email(self, e: IntegrityError, email: str) -> None:
+        # Verificar se é erro de email duplicado
+        if "email" in str(e.orig).lower() or "unique" in str(e.orig).lower():
+            raise exception_400_BAD_REQUEST(detail=f"Email {email} já está em uso")
+
+
+class UserService(BaseUserService):
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        sort_by: Optional[str] = None,
+        sort_dir: str = "asc",
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        cursor: Optional[str] = None
+    ) -> List[ResponseType]:
+        query = self._list_statement(skip, limit, sort_by, sort_dir, search, filter_conditions, cursor)
+        users = self.db.execute(query).scalars().all()
 
         # Converter para schema de resposta
         return [self._to_response(user) for user in users]
 
     def get(self, id: UUID) -> ResponseType:
-        user = self.db.query(ObjectType).filter(
-            ObjectType.id == id,
-            ObjectType.flg_deleted == False
-        ).first()
-        
+        user = self.db.execute(self._by_id_statement(id)).scalars().first()
+
         if not user:
             raise exception_404_NOT_FOUND(detail=f"Usuário com ID {id} não encontrado")
-        
+
         return self._to_response(user)
-    
+
+    def list_rows(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        sort_by: Optional[str] = None,
+        sort_dir: str = "asc",
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], str]:
+        """
+        Leitura rápida: só as colunas da resposta (ou de fields), sem identity map
+        e sem model_validate por linha. Retorna (linhas, cursor da próxima página, ETag fraco).
+        """
+        query, sort_columns = self._list_rows_statement(
+            skip, limit, sort_by, sort_dir, search, filter_conditions, cursor, fields
+        )
+        rows = [self._row_to_dict(row) for row in self.db.execute(query)]
+        return self._page(rows, limit, sort_columns, fields)
+
+    def get_row(self, id: UUID, fields: Optional[List[str]] = None) -> Tuple[Dict[str, Any], datetime]:
+        """Retorna (linha, updated_at); updated_at sempre é lido para os validadores HTTP"""
+        columns = self._projection(fields, extra=[ObjectType.updated_at])
+        row = self.db.execute(self._by_id_statement(id, columns=columns)).first()
+
+        if not row:
+            raise exception_404_NOT_FOUND(detail=f"Usuário com ID {id} não encontrado")
+
+        return self._row_to_dict(row, fields), row.updated_at
+
+    def get_rows(self, ids: List[UUID], fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Busca em lote com um único WHERE id = ANY(:ids), mantendo a ordem dos ids"""
+        query = self._by_ids_statement(list(dict.fromkeys(ids)), self._projection(fields, extra=[ObjectType.id]))
+        rows = {row.id: self._row_to_dict(row) for row in self.db.execute(query)}
+        return self._batch_get_results(ids, rows, fields)
+
+    def stream_batches(self, query: Any) -> Iterator[List[Dict[str, Any]]]:
+        """Executa o statement de exportação e devolve as linhas em lotes de yield_per"""
+        result = self.db.execute(query)
+        for partition in result.partitions():
+            yield [self._row_to_dict(row) for row in partition]
+
+    def count(
+        self,
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        mode: CountMode = CountMode.EXACT
+    ) -> int:
+        if mode == CountMode.ESTIMATE:
+            return self._estimate(search, filter_conditions)
+
+        key = self._count_key(search, filter_conditions)
+        total = count_cache.get(key)
+        if total is None:
+            total = self.db.execute(self._count_statement(search, filter_conditions)).scalar_one()
+            count_cache.set(key, total)
+        return total
+
+    def _estimate(
+        self,
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None
+    ) -> int:
+        # Sem filtros: estatística da tabela (pg_class.reltuples); -1 quando nunca foi analisada
+        if not search and not filter_conditions:
+            total = self.db.execute(RELTUPLES_SQL, {"table_name": f'"{ObjectType.__tablename__}"'}).scalar()
+            if total is not None and total >= 0:
+                return total
+
+        # Com filtros: estimativa de linhas do planner
+        sql, params = explain_statement(
+            self._estimate_statement(search, filter_conditions), self.db.get_bind().dialect
+        )
+        return plan_rows(self.db.connection().exec_driver_sql(sql, params).scalar())
+
     def user_exists(self, email: str) -> bool:
-        user = self.db.query(ObjectType).filter(
-            ObjectType.email == email,
-            ObjectType.flg_deleted == False
-        ).first()
-        
+        user = self.db.execute(self._by_email_statement(email)).scalars().first()
+
         if not user:
             return False
         return True
-    
-    def get_user_by_email(self, email: str, password: str) -> ObjectType:
-        user = self.db.query(ObjectType).filter(
-            ObjectType.email == email,
-            ObjectType.flg_deleted == False
-        ).first()
 
-        # Existe usuário? 
+    async def import_users(self, lines: List[bytes]) -> UserImportReport:
+        """
+        Importação em lote: valida as linhas, gera os hashes em paralelo no pool,
+        carrega com COPY numa tabela temporária e insere tudo com um único INSERT.
+        """
+        valid, errors = self._parse_import_lines(lines)
+        hashed_passwords = await get_password_hashes_async([item.password for _, item in valid])
+        records = self._import_records(valid, hashed_passwords)
+
+        inserted_ids = set()
+        if records:
+            try:
+                self.db.execute(IMPORT_STAGING_DDL)
+                # COPY precisa da conexão do driver (psycopg2), na mesma transação da sessão
+                driver_connection = self.db.connection().connection.driver_connection
+                with driver_connection.cursor() as cursor:
+                    cursor.copy_expert(IMPORT_COPY_SQL, self._import_csv(records))
+                # text() sem tipos: psycopg2 devolve o uuid como str
+                inserted_ids = {UUID(str(row.id)) for row in self.db.execute(IMPORT_INSERT_SQL)}
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            self._after_write()
+
+        return self._import_report(records, inserted_ids, errors)
+
+    async def get_user_by_email(self, email: str, password: str) -> ObjectType:
+        user = self.db.execute(self._by_email_statement(email)).scalars().first()
+
+        # Existe usuário?
         if not user:
             raise exception_404_NOT_FOUND(detail=f"Usuário com email {email} não encontrado")
 
-        # Senha correta?
-        if not verify_password(password, user.password):
+        # Senha correta? (bcrypt roda no pool de hash)
+        if not await verify_password_async(password, user.password):
             raise exception_401_UNAUTHORIZED(detail="Senha incorreta")
-        
+
         # Retorna usuário
         return user
 
-    def create(self, obj: CreateType) -> ResponseType:
+    async def create(self, obj: CreateType) -> ResponseType:
         # Verificar se email já existe
-        existing_user = self.db.query(ObjectType).filter(
-            ObjectType.email == obj.email,
-            ObjectType.flg_deleted == False
-        ).first()
-        
-        if existing_user:
+        if self.user_exists(obj.email):
             raise exception_400_BAD_REQUEST(detail=f"Email {obj.email} já está em uso")
-        
-        # Hash da senha
-        hashed_password = get_password_hash(obj.password)
-        
-        # Criar usuário
-        new_user = ObjectType(
-            name=obj.name,
-            email=obj.email,
-            password=hashed_password,
-            permissions=obj.permissions or []
-        )
-        
+
+        # Criar usuário com hash da senha
+        new_user = self._new_object(obj, await get_password_hash_async(obj.password))
+
         try:
             self.db.add(new_user)
             self.db.commit()
             self.db.refresh(new_user)
         except IntegrityError as e:
             self.db.rollback()
-            # Verificar se é erro de email duplicado
-            if "email" in str(e.orig).lower() or "unique" in str(e.orig).lower():
-                raise exception_400_BAD_REQUEST(detail=f"Email {obj.email} já está em uso")
+            self._raise_if_duplicate_email(e, obj.email)
             raise
-        
+        self._after_write()
+
         return self._to_response(new_user)
 
-    def update(self, obj: UpdateType) -> ResponseType:
-        user = self.db.query(ObjectType).filter(
-            ObjectType.id == obj.id,
-            ObjectType.flg_deleted == False
-        ).first()
-        
+    async def update(self, obj: UpdateType) -> ResponseType:
+        user = self.db.execute(self._by_id_statement(obj.id)).scalars().first()
+
         if not user:
             raise exception_404_NOT_FOUND(detail=f"Usuário com ID {obj.id} não encontrado")
-        
+
         # Verificar se email já existe em outro usuário
         if obj.email and obj.email != user.email:
-            existing_user = self.db.query(ObjectType).filter(
-                ObjectType.email == obj.email,
-                ObjectType.flg_deleted == False,
-                ObjectType.id != obj.id
-            ).first()
-            
+            existing_user = self.db.execute(
+                self._by_email_statement(obj.email, exclude_id=obj.id)
+            ).scalars().first()
+
             if existing_user:
                 raise exception_400_BAD_REQUEST(detail=f"Email {obj.email} já está em uso")
-        
-        # Atualizar campos se fornecidos usando model_dump (exclui None e id)
-        update_data = obj.model_dump(exclude_none=True, exclude={"id", "password"})
-        
-        for field, value in update_data.items():
-            setattr(user, field, value)
-        
-        # Password precisa de hash especial
-        if obj.password is not None:
-            user.password = get_password_hash(obj.password)
-        
-        self.db.commit()
-        self.db.refresh(user)
-        
+
+        self._apply_update(user, obj, await self._hash_if_present(obj.password))
+
+        try:
+            self.db.commit()
+            self.db.refresh(user)
+        except IntegrityError as e:
+            # Email de um usuário excluído (o índice único de lower(email) cobre todas as linhas)
+            self.db.rollback()
+            self._raise_if_duplicate_email(e, obj.email)
+            raise
+        self._after_write([user.id])
+
         return self._to_response(user)
 
-    def delete(self, obj: DeleteType) -> ResponseType:
+    async def delete(self, obj: DeleteType) -> ResponseType:
         # Deleta um usuário após validar a senha
-        user = self.db.query(ObjectType).filter(
-            ObjectType.id == obj.id,
-            ObjectType.flg_deleted == False
-        ).first()
-        
+        user = self.db.execute(self._by_id_statement(obj.id)).scalars().first()
+
         if not user:
             raise exception_404_NOT_FOUND(detail=f"Usuário com ID {obj.id} não encontrado")
-        
+
         # Validar senha
-        if not verify_password(obj.password, user.password):
+        if not await verify_password_async(obj.password, user.password):
             raise exception_401_UNAUTHORIZED(detail="Senha incorreta")
-        
+
         # Soft delete
         user.flg_deleted = True
         self.db.commit()
-        
-        return self._to_response(user)
\ No newline at end of file
+        self._after_write([user.id])
+
+        return self._to_response(user)
+
+    async def update_many(self, items: List[UpdateType]) -> UserBatchReport:
+        """
+        Atualização em lote: valida em memória, confere ids/emails com duas consultas,
+        gera os hashes em paralelo e aplica tudo com um único UPDATE em uma transação.
+        """
+        emails = [item.email for item in items if item.email]
+        lowered, email_owners = self._email_keys(
+            self.db.execute(self._email_owners_statement(emails)).all() if emails else []
+        )
+        valid, errors = self._validate_batch_update(items, lowered)
+
+        ids = [item.id for _, item in valid]
+        existing_ids = set(self.db.execute(self._existing_ids_statement(ids)).scalars()) if ids else set()
+        ready, not_ready = self._check_batch_update(valid, existing_ids, lowered, email_owners)
+        errors.extend(not_ready)
+
+        rows: Dict[UUID, Dict[str, Any]] = {}
+        if ready:
+            statement = self._batch_update_statement(ready, await self._batch_hashes(ready))
+            try:
+                rows = {row.id: self._row_to_dict(row) for row in self.db.execute(statement)}
+                self.db.commit()
+            except IntegrityError:
+                # Email tomado por outra requisição entre a conferência e o UPDATE
+                self.db.rollback()
+                raise exception_400_BAD_REQUEST(detail="Email já está em uso")
+            self._after_write(list(rows))
+
+        return self._batch_report([(index, item.id) for index, item in ready], rows, errors, "updated")
+
+    def delete_many(self, ids: List[UUID]) -> UserBatchReport:
+        """Soft delete em lote com um único UPDATE ... WHERE id = ANY(:ids) RETURNING"""
+        unique, errors = self._unique_ids(ids)
+
+        rows: Dict[UUID, Dict[str, Any]] = {}
+        if unique:
+            try:
+                rows = {row.id: self._row_to_dict(row) for row in self.db.execute(self._batch_delete_statement([id for _, id in unique]))}
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            self._after_write(list(rows))
+
+        return self._batch_report(unique, rows, errors, "deleted")
+
+
+class AsyncUserService(BaseUserService):
+    """Mesma API do UserService, executando as queries em uma AsyncSession."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        sort_by: Optional[str] = None,
+        sort_dir: str = "asc",
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        cursor: Optional[str] = None
+    ) -> List[ResponseType]:
+        query = self._list_statement(skip, limit, sort_by, sort_dir, search, filter_conditions, cursor)
+        users = (await self.db.execute(query)).scalars().all()
+
+        return [self._to_response(user) for user in users]
+
+    async def get(self, id: UUID) -> ResponseType:
+        user = (await self.db.execute(self._by_id_statement(id))).scalars().first()
+
+        if not user:
+            raise exception_404_NOT_FOUND(detail=f"Usuário com ID {id} não encontrado")
+
+        return self._to_response(user)
+
+    async def list_rows(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        sort_by: Optional[str] = None,
+        sort_dir: str = "asc",
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], str]:
+        query, sort_columns = self._list_rows_statement(
+            skip, limit, sort_by, sort_dir, search, filter_conditions, cursor, fields
+        )
+        rows = [self._row_to_dict(row) for row in await self.db.execute(query)]
+        return self._page(rows, limit, sort_columns, fields)
+
+    async def get_row(self, id: UUID, fields: Optional[List[str]] = None) -> Tuple[Dict[str, Any], datetime]:
+        columns = self._projection(fields, extra=[ObjectType.updated_at])
+        row = (await self.db.execute(self._by_id_statement(id, columns=columns))).first()
+
+        if not row:
+            raise exception_404_NOT_FOUND(detail=f"Usuário com ID {id} não encontrado")
+
+        return self._row_to_dict(row, fields), row.updated_at
+
+    async def get_rows(self, ids: List[UUID], fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        query = self._by_ids_statement(list(dict.fromkeys(ids)), self._projection(fields, extra=[ObjectType.id]))
+        rows = {row.id: self._row_to_dict(row) for row in await self.db.execute(query)}
+        return self._batch_get_results(ids, rows, fields)
+
+    async def stream_batches(self, query: Any) -> AsyncIterator[List[Dict[str, Any]]]:
+        result = await self.db.stream(query)
+        async for partition in result.partitions():
+            yield [self._row_to_dict(row) for row in partition]
+
+    async def count(
+        self,
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        mode: CountMode = CountMode.EXACT
+    ) -> int:
+        if mode == CountMode.ESTIMATE:
+            return await self._estimate(search, filter_conditions)
+
+        key = self._count_key(search, filter_conditions)
+        total = count_cache.get(key)
+        if total is None:
+            total = (await self.db.execute(self._count_statement(search, filter_conditions))).scalar_one()
+            count_cache.set(key, total)
+        return total
+
+    async def _estimate(
+        self,
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None
+    ) -> int:
+        if not search and not filter_conditions:
+            total = (await self.db.execute(
+                RELTUPLES_SQL, {"table_name": f'"{ObjectType.__tablename__}"'}
+            )).scalar()
+            if total is not None and total >= 0:
+                return total
+
+        sql, params = explain_statement(
+            self._estimate_statement(search, filter_conditions), self.db.bind.dialect
+        )
+        connection = await self.db.connection()
+        return plan_rows((await connection.exec_driver_sql(sql, params)).scalar())
+
+    async def user_exists(self, email: str) -> bool:
+        user = (await self.db.execute(self._by_email_statement(email))).scalars().first()
+
+        if not user:
+            return False
+        return True
+
+    async def import_users(self, lines: List[bytes]) -> UserImportReport:
+        valid, errors = self._parse_import_lines(lines)
+        hashed_passwords = await get_password_hashes_async([item.password for _, item in valid])
+        records = self._import_records(valid, hashed_passwords)
+
+        inserted_ids = set()
+        if records:
+            try:
+                await self.db.execute(IMPORT_STAGING_DDL)
+                # asyncpg: COPY binário direto dos registros Python
+                connection = await self.db.connection()
+                raw_connection = await connection.get_raw_connection()
+                await raw_connection.driver_connection.copy_records_to_table(
+                    IMPORT_STAGING_TABLE, records=records, columns=IMPORT_COLUMNS
+                )
+                inserted_ids = {UUID(str(row.id)) for row in await self.db.execute(IMPORT_INSERT_SQL)}
+                await self.db.commit()
+            except Exception:
+                await self.db.rollback()
+                raise
+            self._after_write()
+
+        return self._import_report(records, inserted_ids, errors)
+
+    async def get_user_by_email(self, email: str, password: str) -> ObjectType:
+        user = (await self.db.execute(self._by_email_statement(email))).scalars().first()
+
+        if not user:
+            raise exception_404_NOT_FOUND(detail=f"Usuário com email {email} não encontrado")
+
+        if not await verify_password_async(password, user.password):
+            raise exception_401_UNAUTHORIZED(detail="Senha incorreta")
+
+        return user
+
+    async def create(self, obj: CreateType) -> ResponseType:
+        if await self.user_exists(obj.email):
+            raise exception_400_BAD_REQUEST(detail=f"Email {obj.email} já está em uso")
+
+        new_user = self._new_object(obj, await get_password_hash_async(obj.password))
+
+        try:
+            self.db.add(new_user)
+            await self.db.commit()
+            await self.db.refresh(new_user)
+        except IntegrityError as e:
+            await self.db.rollback()
+            self._raise_if_duplicate_email(e, obj.email)
+            raise
+        self._after_write()
+
+        return self._to_response(new_user)
+
+    async def update(self, obj: UpdateType) -> ResponseType:
+        user = (await self.db.execute(self._by_id_statement(obj.id))).scalars().first()
+
+        if not user:
+            raise exception_404_NOT_FOUND(detail=f"Usuário com ID {obj.id} não encontrado")
+
+        if obj.email and obj.email != user.email:
+            existing_user = (await self.db.execute(
+                self._by_email_statement(obj.email, exclude_id=obj.id)
+            )).scalars().first()
+
+            if existing_user:
+                raise exception_400_BAD_REQUEST(detail=f"Email {obj.email} já está em uso")
+
+        self._apply_update(user, obj, await self._hash_if_present(obj.password))
+
+        try:
+            await self.db.commit()
+            await self.db.refresh(user)
+        except IntegrityError as e:
+            await self.db.rollback()
+            self._raise_if_duplicate_email(e, obj.email)
+            raise
+        self._after_write([user.id])
+
+        return self._to_response(user)
+
+    async def delete(self, obj: DeleteType) -> ResponseType:
+        user = (await self.db.execute(self._by_id_statement(obj.id))).scalars().first()
+
+        if not user:
+            raise exception_404_NOT_FOUND(detail=f"Usuário com ID {obj.id} não encontrado")
+
+        if not await verify_password_async(obj.password, user.password):
+            raise exception_401_UNAUTHORIZED(detail="Senha incorreta")
+
+        user.flg_deleted = True
+        await self.db.commit()
+        self._after_write([user.id])
+
+        return self._to_response(user)
+
+    async def update_many(self, items: List[UpdateType]) -> UserBatchReport:
+        emails = [item.email for item in items if item.email]
+        lowered, email_owners = self._email_keys(
+            (await self.db.execute(self._email_owners_statement(emails))).all() if emails else []
+        )
+        valid, errors = self._validate_batch_update(items, lowered)
+
+        ids = [item.id for _, item in valid]
+        existing_ids = set((await self.db.execute(self._existing_ids_statement(ids))).scalars()) if ids else set()
+        ready, not_ready = self._check_batch_update(valid, existing_ids, lowered, email_owners)
+        errors.extend(not_ready)
+
+        rows: Dict[UUID, Dict[str, Any]] = {}
+        if ready:
+            statement = self._batch_update_statement(ready, await self._batch_hashes(ready))
+            try:
+                rows = {row.id: self._row_to_dict(row) for row in await self.db.execute(statement)}
+                await self.db.commit()
+            except IntegrityError:
+                await self.db.rollback()
+                raise exception_400_BAD_REQUEST(detail="Email já está em uso")
+            self._after_write(list(rows))
+
+        return self._batch_report([(index, item.id) for index, item in ready], rows, errors, "updated")
+
+    async def delete_many(self, ids: List[UUID]) -> UserBatchReport:
+        unique, errors = self._unique_ids(ids)
+
+        rows: Dict[UUID, Dict[str, Any]] = {}
+        if unique:
+            try:
+                rows = {
+                    row.id: self._row_to_dict(row)
+                    for row in await self.db.execute(self._batch_delete_statement([id for _, id in unique]))
+                }
+                await self.db.commit()
+            except Exception:
+                await self.db.rollback()
+                raise
+            self._after_write(list(rows))
+
+        return self._batch_report(unique, rows, errors, "deleted")
@@ -1,8 +1,12 @@
-from api.v1._shared.schemas import UserCreate, UserUpdate, UserDelete, UserResponse
-from typing import List, Optional
+import asyncio
+from api.v1._shared.schemas import UserBatchReport, UserCreate, UserUpdate, UserDelete, UserImportReport, UserResponse
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from api.v1.user.service import UserService
+from api.v1.user.service import AsyncUserService, UserService
+from api.utils.counting import CountMode
 from api.utils.db_filter import FilterCondition
 
 CreateType = UserCreate
@@ -10,44 +14,187 @@ UpdateType = UserUpdate
 DeleteType = UserDelete
 ResponseType = UserResponse
 service = UserService
+async_service = AsyncUserService
 
 class UserUseCase:
 
     def __init__(self, db: Session):
         self.service = service(db)
 
-    def list(
+    def _normalize_filters(
+        self,
+        search: Optional[str],
+        filter_conditions: Optional[List[FilterCondition]]
+    ) -> Optional[List[FilterCondition]]:
+        # Regra de negócio:
+        # Se receber search e filter_conditions priorizar search.
+        if search and filter_conditions:
+            return None
+        return filter_conditions
+
+    async def list(
         self,
         skip: int = 0,
         limit: int = 10,
         sort_by: Optional[str] = None,
         sort_dir: str = "asc",
         search: Optional[str] = None,
-        filter_conditions: Optional[List[FilterCondition]] = None
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        cursor: Optional[str] = None
     ) -> List[ResponseType]:
+        return await asyncio.to_thread(
+            self.service.list,
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            search=search,
+            filter_conditions=self._normalize_filters(search, filter_conditions),
+            cursor=cursor
+        )
 
-        # Regra de negócio: 
-        # Se receber search e filter_conditions priorizar search.
-        if search and filter_conditions:
-            filter_conditions = None
-        
-        return self.service.list(
+    async def list_rows(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        sort_by: Optional[str] = None,
+        sort_dir: str = "asc",
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], str]:
+        # Consultas síncronas rodam numa thread: o loop fica livre e o single-flight (controller)
+        # consegue juntar as requisições iguais que chegam enquanto elas rodam
+        return await asyncio.to_thread(
+            self.service.list_rows,
             skip=skip,
             limit=limit,
             sort_by=sort_by,
             sort_dir=sort_dir,
             search=search,
-            filter_conditions=filter_conditions
+            filter_conditions=self._normalize_filters(search, filter_conditions),
+            cursor=cursor,
+            fields=fields
         )
 
-    def get(self, id: UUID) -> ResponseType:
-        return self.service.get(id)
+    async def get_row(self, id: UUID, fields: Optional[List[str]] = None) -> Tuple[Dict[str, Any], datetime]:
+        return await asyncio.to_thread(self.service.get_row, id, fields)
+
+    async def get_rows(self, ids: List[UUID], fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.service.get_rows, ids, fields)
+
+    def export_statement(
+        self,
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        batch_size: int = 1000
+    ) -> Any:
+        # Montado antes do streaming para que filtros inválidos ainda virem 400
+        return self.service._export_statement(
+            search, self._normalize_filters(search, filter_conditions), batch_size
+        )
+
+    def stream_batches(self, query: Any) -> Iterator[List[Dict[str, Any]]]:
+        return self.service.stream_batches(query)
+
+    async def count(
+        self,
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        mode: CountMode = CountMode.EXACT
+    ) -> int:
+        return await asyncio.to_thread(
+            self.service.count, search, self._normalize_filters(search, filter_conditions), mode
+        )
+
+    async def get(self, id: UUID) -> ResponseType:
+        return await asyncio.to_thread(self.service.get, id)
+
+    async def create(self, obj: CreateType) -> ResponseType:
+        return await self.service.create(obj)
+
+    async def import_users(self, lines: List[bytes]) -> UserImportReport:
+        return await self.service.import_users(lines)
+
+    async def update(self, obj: UpdateType) -> ResponseType:
+        return await self.service.update(obj)
+
+    async def delete(self, obj: DeleteType) -> ResponseType:
+        return await self.service.delete(obj)
+
+    async def update_many(self, items: List[UpdateType]) -> UserBatchReport:
+        return await self.service.update_many(items)
+
+    async def delete_many(self, ids: List[UUID]) -> UserBatchReport:
+        # Caches invalidados no _after_write são thread-safe (TTLCache/ResponseCache com lock)
+        return await asyncio.to_thread(self.service.delete_many, ids)
+
+
+class AsyncUserUseCase(UserUseCase):
+    """Mesmas regras do UserUseCase, sobre o AsyncUserService."""
+
+    def __init__(self, db: AsyncSession):
+        self.service = async_service(db)
+
+    async def list(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        sort_by: Optional[str] = None,
+        sort_dir: str = "asc",
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        cursor: Optional[str] = None
+    ) -> List[ResponseType]:
+        return await self.service.list(
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            search=search,
+            filter_conditions=self._normalize_filters(search, filter_conditions),
+            cursor=cursor
+        )
+
+    async def get(self, id: UUID) -> ResponseType:
+        return await self.service.get(id)
+
+    async def count(
+        self,
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        mode: CountMode = CountMode.EXACT
+    ) -> int:
+        return await self.service.count(search, self._normalize_filters(search, filter_conditions), mode)
+
+    async def list_rows(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        sort_by: Optional[str] = None,
+        sort_dir: str = "asc",
+        search: Optional[str] = None,
+        filter_conditions: Optional[List[FilterCondition]] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], str]:
+        return await self.service.list_rows(
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            search=search,
+            filter_conditions=self._normalize_filters(search, filter_conditions),
+            cursor=cursor,
+            fields=fields
+        )
 
-    def create(self, obj: CreateType) -> ResponseType:
-        return self.service.create(obj)
+    async def get_row(self, id: UUID, fields: Optional[List[str]] = None) -> Tuple[Dict[str, Any], datetime]:
+        return await self.service.get_row(id, fields)
 
-    def update(self, obj: UpdateType) -> ResponseType:
-        return self.service.update(obj)
+    async def delete_many(self, ids: List[UUID]) -> UserBatchReport:
+        return await self.service.delete_many(ids)
 
-    def delete(self, obj: DeleteType) -> ResponseType:
-        return self.service.delete(obj)
\ No newline at end of file
+    async def get_rows(self, ids: List[UUID], fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        return await self.service.get_rows(ids, fields)
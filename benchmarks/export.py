@@ -0,0 +1,75 @@
+"""
+Mede throughput e memória da exportação em streaming (GET /users/export).
+
+Consome o mesmo gerador usado pelo endpoint (cursor no servidor + yield_per)
+e acompanha o RSS do processo durante a leitura.
+
+Uso:
+    python -m benchmarks.export --seed 1000000 --format ndjson
+    python -m benchmarks.export --format csv --batch-size 5000
+"""
+import argparse
+import json
+import os
+import resource
+import time
+
+from sqlalchemy import text
+
+from api.utils.db_services import engine
+from api.utils.export import ExportFormat
+from api.v1.user.controller import _export_sync
+from api.v1.user.use_case import UserUseCase
+from benchmarks.search_plan import SEED_SQL
+
+
+def _rss_mb() -> float:
+    # RSS atual via /proc (Linux); ru_maxrss fica como pico do processo inteiro
+    with open("/proc/self/statm") as statm:
+        pages = int(statm.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Quantidade de usuários sintéticos a inserir")
+    parser.add_argument("--format", choices=[f.value for f in ExportFormat], default=ExportFormat.NDJSON.value)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.seed:
+        with engine.begin() as connection:
+            connection.execute(SEED_SQL, {"total": args.seed})
+            connection.execute(text('ANALYZE "user"'))
+
+    export_format = ExportFormat(args.format)
+    query = UserUseCase(db=None).export_statement(batch_size=args.batch_size)
+
+    rss_start = _rss_mb()
+    rss_max = rss_start
+    total_bytes = 0
+    lines = 0
+    start = time.perf_counter()
+    for chunk in _export_sync(query, export_format):
+        total_bytes += len(chunk)
+        lines += chunk.count(b"\n")
+        rss_max = max(rss_max, _rss_mb())
+    elapsed = time.perf_counter() - start
+
+    rows = lines - 1 if export_format == ExportFormat.CSV else lines
+    print(json.dumps({
+        "format": export_format.value,
+        "batch_size": args.batch_size,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed else 0,
+        "mb_per_second": total_bytes / (1024 * 1024) / elapsed if elapsed else 0,
+        "rss_start_mb": rss_start,
+        "rss_peak_during_export_mb": rss_max,
+        "rss_growth_mb": rss_max - rss_start,
+        "ru_maxrss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Benchmark de carga ponta a ponta da API (app do main.py).
+
+Dois alvos:
+- asgi: app em processo via httpx.ASGITransport (sem rede; mede a aplicação)
+- uvicorn: app servido por um uvicorn local em subprocesso (HTTP real)
+
+Cada worker (conexão concorrente) usa uma conta própria de benchmark e sorteia
+operações conforme o mix escolhido. O resultado sai em JSON (vazão e p50/p95/p99
+por operação) para comparar execuções.
+
+Uso:
+    python -m benchmarks.load --seed 100000 --target asgi --mix read
+    python -m benchmarks.load --target uvicorn --mix mixed --concurrency 64 --duration 60 --output run.json
+    python -m benchmarks.load --target both --mix auth
+"""
+import argparse
+import asyncio
+from collections import Counter, defaultdict
+import json
+import random
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import text
+
+from api.utils.db_services import DB_ASYNC, engine
+from api.utils.security import get_password_hash
+from benchmarks.search_plan import SEED_SQL
+
+API = "/api/v1"
+BENCH_PASSWORD = "bench-password"
+
+# Pesos de cada operação por mix
+MIXES: Dict[str, Dict[str, int]] = {
+    "read": {
+        "list": 30, "list_search": 15, "list_filter": 10, "list_sort": 10, "list_deep": 5, "get": 20, "me": 10,
+    },
+    "auth": {"login": 40, "refresh": 30, "me": 30},
+    "write": {"update": 60, "get": 20, "me": 20},
+    "mixed": {
+        "login": 5, "refresh": 5, "me": 15, "list": 20, "list_search": 10, "list_filter": 5,
+        "list_sort": 5, "list_deep": 5, "get": 20, "update": 10,
+    },
+}
+SEARCH_TERMS = ["usu", "silva", "bench", "example", "maria", "abc"]
+
+BENCH_ACCOUNTS_SQL = text("""
+    INSERT INTO "user" (id, name, email, password, permissions, created_at, updated_at, flg_deleted)
+    VALUES (gen_random_uuid(), :name, :email, :password, '{USER}', now(), now(), false)
+    ON CONFLICT (email) DO UPDATE SET password = EXCLUDED.password, flg_deleted = false
+    RETURNING id
+""")
+SAMPLE_IDS_SQL = text('SELECT id FROM "user" WHERE NOT flg_deleted ORDER BY random() LIMIT :total')
+COUNT_SQL = text('SELECT count(*) FROM "user" WHERE NOT flg_deleted')
+
+
+def _percentile(values: List[float], q: float) -> float:
+    # Nearest-rank sobre a lista já ordenada
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(q * len(values))) - 1))]
+
+
+def _prepare(seed: int, accounts: int, sample_size: int) -> Dict[str, Any]:
+    """Semeia a tabela (opcional), garante as contas de benchmark e sorteia ids para get"""
+    with engine.begin() as connection:
+        if seed:
+            connection.execute(SEED_SQL, {"total": seed})
+            connection.execute(text('ANALYZE "user"'))
+
+        # Um único hash para todas as contas: o preparo não deve ser limitado pelo bcrypt
+        hashed = get_password_hash(BENCH_PASSWORD)
+        bench_accounts = []
+        for index in range(accounts):
+            email = f"bench_load_{index}@example.com"
+            id = connection.execute(
+                BENCH_ACCOUNTS_SQL, {"name": f"Bench Load {index}", "email": email, "password": hashed}
+            ).scalar_one()
+            bench_accounts.append({"id": str(id), "email": email})
+
+        ids = [str(row.id) for row in connection.execute(SAMPLE_IDS_SQL, {"total": sample_size})]
+        total = connection.execute(COUNT_SQL).scalar_one()
+    return {"accounts": bench_accounts, "ids": ids, "rows": total}
+
+
+class Worker:
+    """Uma conexão concorrente: mantém os tokens da sua conta e executa as operações"""
+
+    def __init__(self, client: httpx.AsyncClient, account: Dict[str, str], ids: List[str], rows: int, rng: random.Random):
+        self.client = client
+        self.account = account
+        self.ids = ids
+        self.rows = rows
+        self.rng = rng
+        self.access_token: Optional[str] = None
+        self.refresh_token: Optional[str] = None
+
+    def _auth(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+    async def op_login(self) -> httpx.Response:
+        response = await self.client.post(
+            f"{API}/account/login", json={"email": self.account["email"], "password": BENCH_PASSWORD}
+        )
+        if response.status_code == 200:
+            body = response.json()
+            self.access_token = body["access_token"]
+            self.refresh_token = body["refresh_token"]
+        return response
+
+    async def op_refresh(self) -> httpx.Response:
+        response = await self.client.post(f"{API}/account/refresh", json={"refresh_token": self.refresh_token})
+        if response.status_code == 200:
+            body = response.json()
+            self.access_token = body["access_token"]
+            self.refresh_token = body.get("refresh_token") or self.refresh_token
+        return response
+
+    async def op_me(self) -> httpx.Response:
+        return await self.client.get(f"{API}/account/me", headers=self._auth())
+
+    async def op_list(self) -> httpx.Response:
+        return await self.client.get(f"{API}/users", params={"limit": 20}, headers=self._auth())
+
+    async def op_list_search(self) -> httpx.Response:
+        params = {"search": self.rng.choice(SEARCH_TERMS), "limit": 20}
+        return await self.client.get(f"{API}/users", params=params, headers=self._auth())
+
+    async def op_list_filter(self) -> httpx.Response:
+        params = {"name[contains]": self.rng.choice(SEARCH_TERMS), "sort_by": "name", "limit": 20}
+        return await self.client.get(f"{API}/users", params=params, headers=self._auth())
+
+    async def op_list_sort(self) -> httpx.Response:
+        params = {
+            "sort_by": self.rng.choice(["name", "email"]),
+            "sort_dir": self.rng.choice(["asc", "desc"]),
+            "limit": 20,
+        }
+        return await self.client.get(f"{API}/users", params=params, headers=self._auth())
+
+    async def op_list_deep(self) -> httpx.Response:
+        # Páginas profundas por offset: o custo cresce com skip
+        params = {"skip": self.rng.randint(0, max(0, self.rows - 20)), "limit": 20}
+        return await self.client.get(f"{API}/users", params=params, headers=self._auth())
+
+    async def op_get(self) -> httpx.Response:
+        return await self.client.get(f"{API}/users/{self.rng.choice(self.ids)}", headers=self._auth())
+
+    async def op_update(self) -> httpx.Response:
+        body = {"id": self.account["id"], "name": f"Bench Load {self.rng.randint(0, 1_000_000)}"}
+        return await self.client.put(f"{API}/users", json=body, headers=self._auth())
+
+
+async def _run_worker(
+    worker: Worker,
+    operations: List[str],
+    weights: List[int],
+    measure_from: float,
+    stop_at: float,
+    latencies: Dict[str, List[float]],
+    statuses: Dict[str, Counter]
+) -> None:
+    while time.perf_counter() < stop_at:
+        name = worker.rng.choices(operations, weights)[0]
+        # Sem token (início ou após 401, ex: token revogado por update): login antes
+        if worker.access_token is None and name != "login":
+            name = "login"
+        elif name == "refresh" and worker.refresh_token is None:
+            name = "login"
+
+        start = time.perf_counter()
+        try:
+            response = await getattr(worker, f"op_{name}")()
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if status == 401:
+            worker.access_token = None
+        if start >= measure_from:
+            latencies[name].append(elapsed_ms)
+            statuses[name][str(status)] += 1
+
+
+async def _run_target(client: httpx.AsyncClient, prepared: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    mix = MIXES[args.mix]
+    operations, weights = list(mix), list(mix.values())
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    accounts = prepared["accounts"]
+    workers = [
+        Worker(client, accounts[index % len(accounts)], prepared["ids"], prepared["rows"], random.Random(args.rng_seed + index))
+        for index in range(args.concurrency)
+    ]
+
+    start = time.perf_counter()
+    measure_from = start + args.warmup
+    stop_at = measure_from + args.duration
+    await asyncio.gather(*[
+        _run_worker(worker, operations, weights, measure_from, stop_at, latencies, statuses)
+        for worker in workers
+    ])
+    measured = time.perf_counter() - measure_from
+
+    report: Dict[str, Any] = {"operations": {}}
+    all_latencies: List[float] = []
+    total_errors = 0
+    for name in sorted(latencies):
+        values = sorted(latencies[name])
+        all_latencies.extend(values)
+        errors = sum(count for status, count in statuses[name].items() if not status.startswith(("2", "3")))
+        total_errors += errors
+        report["operations"][name] = {
+            "requests": len(values),
+            "errors": errors,
+            "statuses": dict(statuses[name]),
+            "throughput_rps": len(values) / measured,
+            "mean_ms": sum(values) / len(values),
+            "p50_ms": _percentile(values, 0.50),
+            "p95_ms": _percentile(values, 0.95),
+            "p99_ms": _percentile(values, 0.99),
+            "max_ms": values[-1],
+        }
+
+    all_latencies.sort()
+    report["total"] = {
+        "requests": len(all_latencies),
+        "errors": total_errors,
+        "seconds": measured,
+        "throughput_rps": len(all_latencies) / measured,
+        "p50_ms": _percentile(all_latencies, 0.50),
+        "p95_ms": _percentile(all_latencies, 0.95),
+        "p99_ms": _percentile(all_latencies, 0.99),
+    }
+    return report
+
+
+async def _run_asgi(prepared: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+        return await _run_target(client, prepared, args)
+
+
+def _wait_ready(base_url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn terminou antes de ficar pronto")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("uvicorn não respondeu /health a tempo")
+
+
+async def _run_uvicorn(prepared: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    base_url = f"http://127.0.0.1:{args.port}"
+    process = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(args.port),
+        "--workers", str(args.workers), "--log-level", "warning", "--no-access-log",
+    ])
+    try:
+        await asyncio.to_thread(_wait_ready, base_url, process)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+            return await _run_target(client, prepared, args)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def _git_rev() -> Optional[str]:
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["asgi", "uvicorn", "both"], default="asgi")
+    parser.add_argument("--mix", choices=list(MIXES), default="mixed")
+    parser.add_argument("--seed", type=int, default=0, help="Quantidade de usuários sintéticos a inserir antes")
+    parser.add_argument("--accounts", type=int, default=16, help="Contas de benchmark (login/refresh/update)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0, help="Segundos medidos")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Segundos descartados no início")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="Processos do uvicorn")
+    parser.add_argument("--rng-seed", type=int, default=42, help="Semente do sorteio de operações")
+    parser.add_argument("--output", help="Arquivo JSON de saída (além do stdout)")
+    args = parser.parse_args()
+
+    prepared = _prepare(args.seed, args.accounts, sample_size=1000)
+
+    results: Dict[str, Any] = {
+        "config": {
+            **{key: value for key, value in vars(args).items() if key != "output"},
+            "db_async": DB_ASYNC,
+            "rows": prepared["rows"],
+            "python": sys.version.split()[0],
+            "git_rev": _git_rev(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "targets": {},
+    }
+    targets = ["asgi", "uvicorn"] if args.target == "both" else [args.target]
+    for target in targets:
+        runner = _run_asgi if target == "asgi" else _run_uvicorn
+        results["targets"][target] = asyncio.run(runner(prepared, args))
+
+    output = json.dumps(results, indent=2, default=str)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Regressão de planos de consulta da listagem de usuários.
+
+Enumera as combinações suportadas por UserService.list:
+    (sem filtro | search | campo[operador] para cada filter_field × FilterOperator)
+    × (ordenação padrão | sort_by × sort_dir para cada sort_field)
+e também as leituras pontuais (por id, por email, autenticação) e a leitura incremental
+do conjunto de revogação (updated_at > marca), que cada worker repete a cada poucos segundos.
+
+Para cada uma roda EXPLAIN (FORMAT JSON) no SQL gerado pelo próprio serviço e falha
+(exit code 1) se o plano tiver Seq Scan na tabela user ou custo acima do orçamento.
+Precisa de uma base semeada (ex: python -m benchmarks.seed_users --rows 1000000):
+em tabela pequena o planner prefere seq scan e o resultado não significa nada.
+
+Uso:
+    python -m benchmarks.plan_check
+    python -m benchmarks.plan_check --max-cost 5000 --output plans.json
+    python -m benchmarks.plan_check --allow-seq-scan "name[ne]"   # combinações aceitas conscientemente
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+import json
+import sys
+from typing import Any, Dict, List, Tuple
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from api.utils.counting import RELTUPLES_SQL, explain_statement
+from api.utils.db_filter import FilterCondition, FilterOperator
+from api.utils.db_services import engine
+from api.utils.revocation import _changes_statement
+from api.utils.security import ACCESS_TOKEN_EXPIRE_MINUTES, _current_user_statement
+from api.v1.user.service import ObjectType, UserService, filter_fields, sort_fields
+
+SEQ_SCAN_NODES = {"Seq Scan", "Parallel Seq Scan"}
+
+
+def _filters(term: str) -> List[Tuple[str, Dict[str, Any]]]:
+    combos: List[Tuple[str, Dict[str, Any]]] = [("sem_filtro", {}), ("search", {"search": term})]
+    for field in filter_fields:
+        for operator in FilterOperator:
+            condition = FilterCondition(campo=field, operador=operator, valor=term)
+            combos.append((f"{field}[{operator.value}]", {"filter_conditions": [condition]}))
+    return combos
+
+
+def _sorts() -> List[Tuple[str, Dict[str, Any]]]:
+    combos: List[Tuple[str, Dict[str, Any]]] = [("created_at desc (padrão)", {})]
+    for field in sort_fields:
+        for direction in ("asc", "desc"):
+            combos.append((f"{field} {direction}", {"sort_by": field, "sort_dir": direction}))
+    return combos
+
+
+def scenarios(term: str, limit: int, email: str) -> List[Tuple[str, Any]]:
+    service = UserService(db=None)
+    result = []
+    for filter_name, filter_kwargs in _filters(term):
+        for sort_name, sort_kwargs in _sorts():
+            statement, _ = service._list_rows_statement(limit=limit, **filter_kwargs, **sort_kwargs)
+            result.append((f"list {filter_name} | {sort_name}", statement))
+
+    result += [
+        ("get_by_id", service._by_id_statement(uuid4())),
+        ("get_by_email", service._by_email_statement(email)),
+        ("auth current_user", _current_user_statement(uuid4())),
+        # Pior caso do refresh: a carga inicial lê a janela inteira de vida do access token
+        ("revocation refresh", _changes_statement(
+            datetime.now(timezone.utc) - timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        )),
+    ]
+    return result
+
+
+def _walk(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(_walk(child))
+    return nodes
+
+
+def check(
+    connection: Any,
+    name: str,
+    statement: Any,
+    max_cost: float,
+    allow_seq_scan: List[str]
+) -> Dict[str, Any]:
+    sql, params = explain_statement(statement, engine.dialect)
+    plan = connection.exec_driver_sql(sql, params).scalar()[0]["Plan"]
+    nodes = _walk(plan)
+
+    problems = []
+    seq_scans = [
+        node for node in nodes
+        if node["Node Type"] in SEQ_SCAN_NODES and node.get("Relation Name") == ObjectType.__tablename__
+    ]
+    if seq_scans and not any(allowed in name for allowed in allow_seq_scan):
+        problems.append("seq scan em user")
+    if plan["Total Cost"] > max_cost:
+        problems.append(f"custo {plan['Total Cost']:.0f} > {max_cost:.0f}")
+
+    return {
+        "name": name,
+        "ok": not problems,
+        "problems": problems,
+        "total_cost": plan["Total Cost"],
+        "plan_rows": plan["Plan Rows"],
+        "nodes": [
+            f"{node['Node Type']}" + (f" ({node['Index Name']})" if node.get("Index Name") else "")
+            for node in nodes
+        ],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--term", default="silva", help="Valor usado em search e nos filtros")
+    parser.add_argument("--email", default="maria.silva@gmail.com", help="Email das leituras pontuais")
+    parser.add_argument("--limit", type=int, default=10, help="limit da página (padrão do endpoint)")
+    parser.add_argument("--max-cost", type=float, default=10000.0, help="Orçamento de custo do planner")
+    parser.add_argument("--min-rows", type=int, default=100000, help="Mínimo de linhas estimadas na tabela")
+    parser.add_argument(
+        "--allow-seq-scan", action="append", default=[],
+        help="Trecho do nome da combinação em que seq scan é aceito (pode repetir)"
+    )
+    parser.add_argument("--output", help="Arquivo JSON com o relatório completo")
+    args = parser.parse_args()
+
+    with engine.connect() as connection:
+        rows = connection.execute(RELTUPLES_SQL, {"table_name": f'"{ObjectType.__tablename__}"'}).scalar()
+        if rows is None or rows < args.min_rows:
+            print(
+                f"Tabela user com ~{rows} linhas (mínimo {args.min_rows}). "
+                f"Semeie com python -m benchmarks.seed_users e rode ANALYZE.",
+                file=sys.stderr
+            )
+            return 2
+
+        # Estatísticas atualizadas: o plano depende delas
+        connection.execute(text(f'ANALYZE "{ObjectType.__tablename__}"'))
+        results = [
+            check(connection, name, statement, args.max_cost, args.allow_seq_scan)
+            for name, statement in scenarios(args.term, args.limit, args.email)
+        ]
+
+    width = max(len(result["name"]) for result in results)
+    for result in results:
+        status = "OK  " if result["ok"] else "FAIL"
+        detail = "; ".join(result["problems"]) or " > ".join(result["nodes"])
+        print(f"{status} {result['name']:<{width}}  cost={result['total_cost']:>10.1f}  {detail}")
+
+    failed = [result for result in results if not result["ok"]]
+    print(f"\n{len(results) - len(failed)}/{len(results)} combinações dentro do orçamento")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"rows": rows, "max_cost": args.max_cost, "results": results}, file, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Compara as duas leituras de GET /users para páginas de limit=100:
+
+- orm: UserService.list (entidades ORM + _to_response/model_validate por linha)
+       serializado como o FastAPI faz com response_model
+- rows: UserService.list_rows (colunas projetadas em linhas Core) + FastJSONResponse
+
+Uso:
+    python -m benchmarks.read_path --iterations 200 --limit 100
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+from api.utils.db_services import SessionLocal
+from api.utils.responses import FastJSONResponse
+from api.v1._shared.schemas import UserResponse
+from api.v1.user.service import UserService
+
+
+response_adapter = TypeAdapter(List[UserResponse])
+
+
+def _measure(func: Callable[[], bytes], iterations: int) -> dict:
+    timings = []
+    size = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        size = len(func())
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "mean_ms": statistics.fmean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p95_ms": timings[int(len(timings) * 0.95) - 1],
+        "bytes": size,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--skip", type=int, default=0)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        service = UserService(db)
+
+        def orm_path() -> bytes:
+            users = service.list(skip=args.skip, limit=args.limit)
+            # Mesmo caminho do FastAPI com response_model: valida e serializa
+            body = response_adapter.dump_json(response_adapter.validate_python(users))
+            db.expunge_all()
+            return body
+
+        def rows_path() -> bytes:
+            rows, _, _ = service.list_rows(skip=args.skip, limit=args.limit)
+            return FastJSONResponse(rows).body
+
+        # Aquecimento (conexão, cache de statements)
+        orm_path()
+        rows_path()
+
+        report = {
+            "limit": args.limit,
+            "iterations": args.iterations,
+            "orm": _measure(orm_path, args.iterations),
+            "rows": _measure(rows_path, args.iterations),
+        }
+    finally:
+        db.close()
+
+    report["speedup_mean"] = report["orm"]["mean_ms"] / report["rows"]["mean_ms"]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compara o plano da busca textual (search / contains) com e sem os índices trigram.
+
+Uso:
+    python -m benchmarks.search_plan --seed 1000000 --term silva
+
+- --seed N: insere N usuários sintéticos antes de medir (opcional)
+- O plano "sem índice" é obtido desligando index/bitmap scan na transação,
+  o que reproduz o seq scan de antes da migration acac307fcc8e.
+"""
+import argparse
+import json
+
+from sqlalchemy import text
+
+from api.utils.db_filter import FilterCondition
+from api.utils.db_services import engine
+from api.v1.user.service import UserService
+
+
+SEED_SQL = text("""
+    INSERT INTO "user" (id, name, email, password, permissions, created_at, updated_at, flg_deleted)
+    SELECT
+        gen_random_uuid(),
+        'Usuario ' || md5(i::text),
+        'bench_' || i || '_' || substr(md5(random()::text), 1, 8) || '@example.com',
+        NULL,
+        '{USER}',
+        now() - (i || ' seconds')::interval,
+        now(),
+        false
+    FROM generate_series(1, :total) AS i
+""")
+
+
+def _explain(connection, statement, use_indexes: bool) -> dict:
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with connection.begin():
+        if not use_indexes:
+            connection.execute(text("SET LOCAL enable_indexscan = off"))
+            connection.execute(text("SET LOCAL enable_bitmapscan = off"))
+        result = connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"))
+        return result.scalar()[0]
+
+
+def _node_types(plan: dict) -> list:
+    nodes = [plan["Node Type"]]
+    for child in plan.get("Plans", []):
+        nodes.extend(_node_types(child))
+    return nodes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Quantidade de usuários sintéticos a inserir")
+    parser.add_argument("--term", default="silva", help="Termo de busca")
+    args = parser.parse_args()
+
+    if args.seed:
+        with engine.begin() as connection:
+            connection.execute(SEED_SQL, {"total": args.seed})
+            connection.execute(text('ANALYZE "user"'))
+
+    service = UserService(db=None)
+    scenarios = {
+        "search": service._list_statement(search=args.term),
+        "name[contains]": service._list_statement(
+            filter_conditions=[FilterCondition(campo="name", operador="contains", valor=args.term)]
+        ),
+    }
+
+    report = {}
+    with engine.connect() as connection:
+        for name, statement in scenarios.items():
+            for label, use_indexes in (("sem_indice", False), ("com_indice", True)):
+                explained = _explain(connection, statement, use_indexes)
+                report[f"{name}:{label}"] = {
+                    "nodes": _node_types(explained["Plan"]),
+                    "execution_ms": explained["Execution Time"],
+                    "total_cost": explained["Plan"]["Total Cost"],
+                }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Gerador de usuários sintéticos para testes de escala (1M–10M linhas).
+
+- Nomes/sobrenomes brasileiros com distribuição de frequência tipo Zipf (poucos muito comuns)
+- Emails únicos em domínios com pesos realistas
+- Fração configurável de excluídos (flg_deleted) e de ADMINs
+- created_at concentrado nos meses mais recentes (--skew), updated_at depois dele
+- Poucas senhas conhecidas (senha-0 .. senha-K), com hash bcrypt calculado uma vez e reutilizado
+- Carga com COPY em lotes; mesma --seed gera exatamente as mesmas linhas (inclusive os hashes)
+
+Uso:
+    python -m benchmarks.seed_users --rows 1000000 --seed 42
+    python -m benchmarks.seed_users --rows 10000000 --deleted-fraction 0.1 --batch-size 200000
+    python -m benchmarks.seed_users --rows 1000000 --truncate   # apaga a tabela antes (cuidado)
+
+Rodar de novo com a mesma seed falha no índice único de email: use --truncate ou outra seed.
+"""
+import argparse
+import csv
+from datetime import datetime, timedelta, timezone
+import io
+import itertools
+import json
+import random
+import time
+from typing import Iterator, List, Tuple
+from uuid import UUID
+
+from passlib.hash import bcrypt
+
+from api.utils.db_services import engine
+
+FIRST_NAMES = [
+    "Maria", "José", "Ana", "João", "Antônio", "Francisco", "Carlos", "Paulo", "Pedro", "Lucas",
+    "Luiz", "Marcos", "Luis", "Gabriel", "Rafael", "Francisca", "Daniel", "Marcelo", "Bruno", "Eduardo",
+    "Juliana", "Adriana", "Márcia", "Fernanda", "Patrícia", "Aline", "Sandra", "Camila", "Amanda", "Bruna",
+    "Jéssica", "Letícia", "Júlia", "Luciana", "Vanessa", "Mariana", "Gabriela", "Vera", "Vitória", "Larissa",
+    "Felipe", "Gustavo", "Rodrigo", "Matheus", "Thiago", "Diego", "Leonardo", "Vinícius", "Igor", "Caio",
+]
+LAST_NAMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa",
+    "Rocha", "Dias", "Nascimento", "Andrade", "Moreira", "Nunes", "Marques", "Machado", "Mendes", "Freitas",
+    "Cardoso", "Ramos", "Gonçalves", "Santana", "Teixeira", "Araújo", "Pinto", "Correia", "Cavalcanti", "Monteiro",
+]
+DOMAINS = [
+    ("gmail.com", 45), ("hotmail.com", 20), ("outlook.com", 10), ("yahoo.com.br", 8),
+    ("uol.com.br", 5), ("bol.com.br", 4), ("icloud.com", 3), ("empresa.com.br", 5),
+]
+COLUMNS = ["id", "name", "email", "password", "permissions", "created_at", "updated_at", "flg_deleted"]
+COPY_SQL = f'COPY "user" ({", ".join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)'
+
+BCRYPT_ALPHABET = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def _zipf_weights(size: int, exponent: float = 1.0) -> List[float]:
+    return [1 / (rank ** exponent) for rank in range(1, size + 1)]
+
+
+def _deterministic_hashes(rng: random.Random, total: int) -> List[Tuple[str, str]]:
+    """(senha, hash) com salt sorteado pelo rng: a mesma seed produz os mesmos hashes"""
+    hashes = []
+    for index in range(total):
+        # Último caractere do salt bcrypt só aceita .Oeu (bits não usados zerados)
+        salt = "".join(rng.choice(BCRYPT_ALPHABET) for _ in range(21)) + rng.choice(".Oeu")
+        password = f"senha-{index}"
+        hashes.append((password, bcrypt.using(salt=salt, ident="2b").hash(password)))
+    return hashes
+
+
+def _email_local(value: str) -> str:
+    # Remove acentos simples para o email (ã -> a, ç -> c, ...)
+    table = str.maketrans("áàâãéêíóôõúüçÁÀÂÃÉÊÍÓÔÕÚÜÇ", "aaaaeeiooouucAAAAEEIOOOUUC")
+    return value.translate(table).lower()
+
+
+def generate_rows(
+    rows: int,
+    seed: int,
+    deleted_fraction: float,
+    admin_fraction: float,
+    days: int,
+    skew: float,
+    until: datetime,
+    hashes: List[Tuple[str, str]]
+) -> Iterator[list]:
+    rng = random.Random(seed)
+    first_weights = list(itertools.accumulate(_zipf_weights(len(FIRST_NAMES))))
+    last_weights = list(itertools.accumulate(_zipf_weights(len(LAST_NAMES), 0.8)))
+    domain_names = [domain for domain, _ in DOMAINS]
+    domain_weights = list(itertools.accumulate(weight for _, weight in DOMAINS))
+    span = days * 86400
+
+    for index in range(rows):
+        first = rng.choices(FIRST_NAMES, cum_weights=first_weights)[0]
+        middle, last = rng.choices(LAST_NAMES, cum_weights=last_weights, k=2)
+        domain = rng.choices(domain_names, cum_weights=domain_weights)[0]
+        # Sufixo seed + índice (hexadecimal) garante email único dentro e entre seeds
+        suffix = f"{seed:x}-{index:x}"
+        email = f"{_email_local(first)}.{_email_local(last)}.{suffix}@{domain}"
+
+        # u ** skew (> 1) concentra as datas perto de "until": mais cadastros recentes
+        created_at = until - timedelta(seconds=span * (rng.random() ** skew))
+        updated_at = created_at + timedelta(seconds=(until - created_at).total_seconds() * rng.random() * 0.5)
+
+        permissions = "{ADMIN,USER}" if rng.random() < admin_fraction else "{USER}"
+        yield [
+            UUID(int=rng.getrandbits(128), version=4),
+            f"{first} {middle} {last}",
+            email,
+            rng.choice(hashes)[1],
+            permissions,
+            created_at.isoformat(),
+            updated_at.isoformat(),
+            "t" if rng.random() < deleted_fraction else "f",
+        ]
+
+
+def _copy_batches(rows: Iterator[list], batch_size: int) -> Iterator[Tuple[io.StringIO, int]]:
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(batch)
+        buffer.seek(0)
+        yield buffer, len(batch)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--deleted-fraction", type=float, default=0.05)
+    parser.add_argument("--admin-fraction", type=float, default=0.001)
+    parser.add_argument("--days", type=int, default=5 * 365, help="Janela de created_at (dias até --until)")
+    parser.add_argument("--skew", type=float, default=2.0, help="> 1 concentra cadastros perto de --until")
+    parser.add_argument(
+        "--until", default="2025-01-01T00:00:00-03:00",
+        help="Data final de created_at (fixa para a carga ser reprodutível)"
+    )
+    parser.add_argument("--passwords", type=int, default=8, help="Senhas distintas (hash bcrypt reutilizado)")
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--truncate", action="store_true", help="TRUNCATE na tabela user antes da carga")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    hashes = _deterministic_hashes(rng, args.passwords)
+    until = datetime.fromisoformat(args.until).astimezone(timezone.utc)
+    rows = generate_rows(
+        args.rows, args.seed, args.deleted_fraction, args.admin_fraction, args.days, args.skew, until, hashes
+    )
+
+    start = time.perf_counter()
+    loaded = 0
+    # COPY precisa da conexão do driver (psycopg2); uma transação por lote
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            if args.truncate:
+                cursor.execute('TRUNCATE "user"')
+                connection.commit()
+            for buffer, size in _copy_batches(rows, args.batch_size):
+                cursor.copy_expert(COPY_SQL, buffer)
+                connection.commit()
+                loaded += size
+                elapsed = time.perf_counter() - start
+                print(f"{loaded}/{args.rows} linhas ({loaded / elapsed:,.0f} linhas/s)", flush=True)
+            cursor.execute('ANALYZE "user"')
+            connection.commit()
+    finally:
+        connection.close()
+
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "rows": loaded,
+        "seed": args.seed,
+        "seconds": elapsed,
+        "rows_per_second": loaded / elapsed if elapsed else 0,
+        "deleted_fraction": args.deleted_fraction,
+        "passwords": [password for password, _ in hashes],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
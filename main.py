@@ -1,14 +1,38 @@
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from api.utils.counting import count_cache
+from api.utils.hashing import hash_executor
+from api.utils.list_cache import list_cache
+from api.utils.loop_watchdog import LOOP_WATCHDOG_ENABLED, LoopWatchdogMiddleware, loop_watchdog
+from api.utils.metrics import CONTENT_TYPE, METRICS_ENABLED, MetricsMiddleware, registry
+from api.utils.profiling import PROFILING_ENABLED, ProfilingMiddleware
+from api.utils.security import principal_cache, revocations
+from api.utils.single_flight import user_reads
+from api.utils.sql_timing import SQL_TIMING_ENABLED, SQLTimingMiddleware
 from api.v1.router import routes
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Watchdog do event loop (opt-in): precisa do loop em execução para iniciar
+    if LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+    yield
+    if LOOP_WATCHDOG_ENABLED:
+        await loop_watchdog.stop()
+    # Libera as threads/processos do pool de hash de senha
+    hash_executor.shutdown()
+
+
 app = FastAPI(
     title="Fakestore API - FastAPI - IA", 
-    version="0.0.1"
+    version="0.0.1",
+    lifespan=lifespan
 )
 
 origins = ["*"]
@@ -19,10 +43,40 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag", "Last-Modified", "Server-Timing", "X-Profile", "X-Profile-Id", "X-Profile-Samples"],
 )
 
+if SQL_TIMING_ENABLED:
+    app.add_middleware(SQLTimingMiddleware)
+
+if LOOP_WATCHDOG_ENABLED:
+    app.add_middleware(LoopWatchdogMiddleware)
+
+# Perfil sob demanda (ADMIN + header X-Profile), com limite global de frequência
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Adicionado por último: é o middleware mais externo e mede também o CORS
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "password_hash_pool": hash_executor.stats(),
+        "principal_cache": principal_cache.stats(),
+        "revocations": revocations.stats(),
+        "count_cache": count_cache.stats(),
+        "list_cache": list_cache.stats(),
+        "single_flight": user_reads.stats(),
+        "event_loop": loop_watchdog.stats(),
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Formato texto do Prometheus: contadores por rota, histogramas de latência, pool e hash
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
 
 app.include_router(routes)
@@ -0,0 +1,68 @@
+"""user active partial indexes
+
+Revision ID: 3c9d2e7f1b04
+Revises: 81aba47cc7ae
+Create Date: 2026-10-16 21:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d2e7f1b04'
+down_revision: Union[str, Sequence[str], None] = '81aba47cc7ae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Todas as consultas filtram flg_deleted = false: os índices só guardam os ativos
+ACTIVE = sa.text('NOT flg_deleted')
+
+# (nome, colunas da ordenação, colunas extras do UserResponse para index-only scan)
+ACTIVE_INDEXES = [
+    # Ordenação padrão da listagem: created_at desc, id desc
+    (
+        'ix_user_active_created_at',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        ['name', 'email', 'permissions', 'updated_at'],
+    ),
+    # sort_fields: (campo, id) atende asc e desc (o btree é lido nos dois sentidos)
+    (
+        'ix_user_active_name',
+        ['name', 'id'],
+        ['email', 'permissions', 'created_at', 'updated_at'],
+    ),
+    (
+        'ix_user_active_email',
+        ['email', 'id'],
+        ['name', 'permissions', 'created_at', 'updated_at'],
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY não roda dentro de transação e não bloqueia escritas na tabela.
+    # Se a criação falhar, o índice fica INVALID: remova-o antes de rodar de novo.
+    with op.get_context().autocommit_block():
+        for name, columns, include in ACTIVE_INDEXES:
+            op.create_index(
+                name, 'user', columns, unique=False,
+                postgresql_where=ACTIVE, postgresql_include=include,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+        # Redundante: a chave primária já tem índice único em id
+        op.drop_index('ix_user_id', table_name='user', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_id', 'user', ['id'], unique=False,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        for name, _, _ in reversed(ACTIVE_INDEXES):
+            op.drop_index(name, table_name='user', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,36 @@
+"""user updated_at index
+
+Revision ID: 5b8e2d4f7a13
+Revises: 9e4b7a1c5d20
+Create Date: 2026-10-16 22:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2d4f7a13'
+down_revision: Union[str, Sequence[str], None] = '9e4b7a1c5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # O conjunto de revogação lê updated_at > marca a cada poucos segundos em cada worker:
+    # sem índice seria um seq scan + sort da tabela inteira. Inclui o id (index-only scan).
+    # Se a criação falhar, o índice fica INVALID: remova-o antes de rodar de novo.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_updated_at', 'user', ['updated_at'], unique=False,
+            postgresql_include=['id'], postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_updated_at', table_name='user', postgresql_concurrently=True, if_exists=True)
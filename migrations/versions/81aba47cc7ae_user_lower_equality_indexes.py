@@ -0,0 +1,41 @@
+"""user lower equality indexes
+
+Revision ID: 81aba47cc7ae
+Revises: acac307fcc8e
+Create Date: 2026-10-16 20:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '81aba47cc7ae'
+down_revision: Union[str, Sequence[str], None] = 'acac307fcc8e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filtros eq/ne e buscas por email comparam lower(coluna) = lower(valor)
+    # CONCURRENTLY (fora da transação) não bloqueia escritas durante o build.
+    # Se a criação falhar, o índice fica INVALID: remova-o antes de rodar de novo.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_email_lower', 'user', [sa.text('lower(email)')], unique=False,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_user_name_lower', 'user', [sa.text('lower(name)')], unique=False,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_name_lower', table_name='user', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_user_email_lower', table_name='user', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,64 @@
+"""user email lower unique
+
+Revision ID: 9e4b7a1c5d20
+Revises: 3c9d2e7f1b04
+Create Date: 2026-10-16 21:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b7a1c5d20'
+down_revision: Union[str, Sequence[str], None] = '3c9d2e7f1b04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Emails iguais ignorando maiúsculas (inclusive excluídos: o índice cobre todas as linhas)
+DUPLICATES_SQL = sa.text("""
+    SELECT lower(email) AS email, count(*) AS total
+    FROM "user"
+    GROUP BY lower(email)
+    HAVING count(*) > 1
+    ORDER BY total DESC, email
+    LIMIT 20
+""")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Login e buscas comparam lower(email): Foo@x.com e foo@x.com não podem coexistir.
+    # Não escolho qual conta manter: com duplicados a migração para e lista os emails.
+    if not context.is_offline_mode():
+        duplicates = op.get_bind().execute(DUPLICATES_SQL).all()
+        if duplicates:
+            listed = ", ".join(f"{row.email} ({row.total})" for row in duplicates)
+            raise RuntimeError(
+                f"Emails duplicados ignorando maiúsculas: {listed}. "
+                "Unifique ou renomeie essas contas antes de rodar a migração."
+            )
+
+    # Se a criação falhar (ex: duplicado inserido durante o build), o índice fica INVALID:
+    # remova-o antes de rodar de novo
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_email_lower_unique', 'user', [sa.text('lower(email)')], unique=True,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        # O índice único também atende as buscas lower(email) = lower(:email)
+        op.drop_index('ix_user_email_lower', table_name='user', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_email_lower', 'user', [sa.text('lower(email)')], unique=False,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index(
+            'ix_user_email_lower_unique', table_name='user', postgresql_concurrently=True, if_exists=True
+        )
@@ -0,0 +1,45 @@
+"""user trgm search indexes
+
+Revision ID: acac307fcc8e
+Revises: 6f5460539762
+Create Date: 2026-10-16 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'acac307fcc8e'
+down_revision: Union[str, Sequence[str], None] = '6f5460539762'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm permite que ILIKE '%termo%' use índice GIN em vez de seq scan
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Build GIN é lento: CONCURRENTLY (fora da transação) não bloqueia escritas durante o build.
+    # Se a criação falhar, o índice fica INVALID: remova-o antes de rodar de novo.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_name_trgm', 'user', ['name'], unique=False,
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_user_email_trgm', 'user', ['email'], unique=False,
+            postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_email_trgm', table_name='user', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_user_name_trgm', table_name='user', postgresql_concurrently=True, if_exists=True)
+    # A extensão pode estar em uso por outros objetos, então não é removida
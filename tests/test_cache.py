@@ -0,0 +1,121 @@
+import pytest
+
+from api.utils import cache as cache_module
+from api.utils.cache import ResponseCache, TTLCache
+from api.utils.list_cache import list_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module, "time", fake)
+    return fake
+
+
+def test_ttl_cache_expira_depois_do_ttl(clock):
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+
+    clock.now += 4.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_descarta_o_menos_usado(clock):
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" passa a ser o mais recente
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_ttl_cache_delete_e_clear(clock):
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.delete("a")
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.invalidations == 2
+
+
+def test_response_cache_nova_geracao_invalida_as_entradas(clock):
+    cache = ResponseCache(max_bytes=1024, ttl=60)
+    cache.set("page", b"[]", {"ETag": 'W/"x"'}, cache.generation)
+    assert cache.get("page") == (b"[]", {"ETag": 'W/"x"'})
+
+    cache.bump()
+
+    assert cache.get("page") is None
+    assert len(cache) == 0
+    assert cache.invalidations == 1
+
+
+def test_response_cache_recusa_pagina_de_geracao_antiga(clock):
+    cache = ResponseCache(max_bytes=1024, ttl=60)
+    generation = cache.generation  # lida antes da consulta
+    cache.bump()  # escrita durante a consulta
+
+    cache.set("page", b"[]", {}, generation)
+
+    assert cache.get("page") is None
+    assert cache.rejected == 1
+
+
+def test_response_cache_descarta_lru_pelo_orcamento_de_bytes(clock):
+    cache = ResponseCache(max_bytes=10, ttl=60)
+    cache.set("a", b"aaaa", {}, 0)
+    cache.set("b", b"bbbb", {}, 0)
+    assert cache.get("a") is not None  # "b" vira o menos usado
+
+    cache.set("c", b"cccc", {}, 0)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.evictions == 1
+    assert cache.stats()["bytes"] == 8
+
+
+def test_response_cache_recusa_corpo_maior_que_o_orcamento(clock):
+    cache = ResponseCache(max_bytes=4, ttl=60)
+    cache.set("a", b"12345", {}, 0)
+
+    assert cache.get("a") is None
+    assert cache.rejected == 1
+
+
+def test_response_cache_expira_depois_do_ttl(clock):
+    cache = ResponseCache(max_bytes=1024, ttl=30)
+    cache.set("page", b"[]", {}, 0)
+
+    clock.now += 30
+    assert cache.get("page") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_chave_da_listagem_nao_junta_buscas_diferentes():
+    key = list_cache_key("user", search="silva")
+
+    assert key == list_cache_key("user", search="silva")
+    assert key != list_cache_key("user", search="silva ")
+    assert key != list_cache_key("user", search="Silva")
+    assert key != list_cache_key("user", search="silva", limit=20)
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from starlette.requests import Request
+
+from api.utils.conditional import http_date, is_not_modified, not_modified, strong_etag, weak_etag
+
+UPDATED_AT = datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+
+
+def _request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_strong_etag_muda_com_updated_at_e_com_a_projecao():
+    id = uuid4()
+    etag = strong_etag(id, UPDATED_AT)
+
+    assert etag.startswith('"') and not etag.startswith("W/")
+    assert etag == strong_etag(id, UPDATED_AT)
+    assert etag != strong_etag(id, UPDATED_AT + timedelta(microseconds=1))
+    assert etag != strong_etag(id, UPDATED_AT, ["id", "name"])
+
+
+def test_weak_etag_depende_da_ordem_dos_itens():
+    first, second = (uuid4(), UPDATED_AT), (uuid4(), UPDATED_AT)
+
+    etag = weak_etag([first, second])
+    assert etag.startswith('W/"')
+    assert etag != weak_etag([second, first])
+
+
+def test_if_none_match_igual_responde_304():
+    etag = strong_etag(uuid4(), UPDATED_AT)
+
+    assert is_not_modified(_request(if_none_match=etag), etag)
+    assert not is_not_modified(_request(if_none_match='"outro"'), etag)
+
+
+def test_if_none_match_usa_comparacao_fraca():
+    weak = weak_etag([(uuid4(), UPDATED_AT)])
+    strong = weak.removeprefix("W/")
+
+    # W/"x" e "x" são equivalentes na comparação fraca, nos dois sentidos
+    assert is_not_modified(_request(if_none_match=strong), weak)
+    assert is_not_modified(_request(if_none_match=weak), strong)
+
+
+def test_if_none_match_com_lista_e_asterisco():
+    etag = strong_etag(uuid4(), UPDATED_AT)
+
+    assert is_not_modified(_request(if_none_match=f'"a", W/"b", {etag}'), etag)
+    assert is_not_modified(_request(if_none_match="*"), etag)
+    assert not is_not_modified(_request(if_none_match='"a", "b"'), etag)
+
+
+def test_if_modified_since_ignora_fracao_de_segundo():
+    etag = strong_etag(uuid4(), UPDATED_AT)
+
+    assert is_not_modified(_request(if_modified_since=http_date(UPDATED_AT)), etag, UPDATED_AT)
+    earlier = http_date(UPDATED_AT - timedelta(seconds=1))
+    assert not is_not_modified(_request(if_modified_since=earlier), etag, UPDATED_AT)
+
+
+def test_if_none_match_tem_precedencia_sobre_if_modified_since():
+    etag = strong_etag(uuid4(), UPDATED_AT)
+    request = _request(if_none_match='"outro"', if_modified_since=http_date(UPDATED_AT))
+
+    # If-Modified-Since diria 304, mas é ignorado quando há If-None-Match (RFC 9110)
+    assert not is_not_modified(request, etag, UPDATED_AT)
+
+
+def test_if_modified_since_invalido_ou_sem_last_modified():
+    etag = strong_etag(uuid4(), UPDATED_AT)
+
+    assert not is_not_modified(_request(if_modified_since="ontem"), etag, UPDATED_AT)
+    assert not is_not_modified(_request(if_modified_since=http_date(UPDATED_AT)), etag)
+    assert not is_not_modified(_request(), etag, UPDATED_AT)
+
+
+def test_not_modified_repete_os_validadores():
+    etag = strong_etag(uuid4(), UPDATED_AT)
+    response = not_modified(etag, UPDATED_AT)
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["ETag"] == etag
+    assert response.headers["Last-Modified"] == "Thu, 02 Jan 2025 03:04:05 GMT"
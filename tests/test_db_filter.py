@@ -0,0 +1,84 @@
+from fastapi import HTTPException
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from api.utils.db_filter import (
+    FilterCondition,
+    build_query_filter,
+    build_search_filter,
+    contains_filter,
+    escape_like,
+    iequals_filter,
+    parse_fields,
+)
+from api.v1._shared.models import User
+
+DIALECT = postgresql.dialect()
+RESPONSE_FIELDS = ["id", "name", "email", "permissions", "created_at", "updated_at"]
+
+
+def _compile(expression):
+    compiled = expression.compile(dialect=DIALECT)
+    return str(compiled), compiled.params
+
+
+@pytest.mark.parametrize("value, escaped", [
+    ("silva", "silva"),
+    ("100%", "100/%"),
+    ("user_name", "user/_name"),
+    ("a/b", "a//b"),
+    ("%_/", "/%/_//"),
+])
+def test_escape_like(value, escaped):
+    assert escape_like(value) == escaped
+
+
+def test_contains_filter_gera_ilike_com_escape_e_padrao_escapado():
+    sql, params = _compile(contains_filter(User.name, "50%_off/a"))
+
+    assert "ILIKE" in sql
+    assert "ESCAPE '/'" in sql
+    assert list(params.values()) == ["%50/%/_off//a%"]
+
+
+def test_iequals_filter_faz_lower_dos_dois_lados_no_banco():
+    sql, params = _compile(iequals_filter(User.email, "Foo@X.com"))
+
+    assert sql.count("lower(") == 2
+    # O valor vai como veio: quem converte para minúsculas é o PostgreSQL
+    assert list(params.values()) == ["Foo@X.com"]
+
+
+def test_build_search_filter_busca_em_todos_os_campos():
+    sql, params = _compile(build_search_filter("sil%", User, ["name", "email"]))
+
+    assert sql.count("ILIKE") == 2
+    assert set(params.values()) == {"%sil/%%"}
+
+
+def test_build_search_filter_exige_tamanho_minimo():
+    with pytest.raises(HTTPException) as error:
+        build_search_filter(" ab ", User, ["name", "email"])
+    assert error.value.status_code == 400
+
+
+def test_build_query_filter_recusa_campo_fora_da_lista():
+    condition = FilterCondition(campo="password", operador="eq", valor="x")
+
+    with pytest.raises(HTTPException) as error:
+        build_query_filter([condition], User, ["name", "email"])
+    assert error.value.status_code == 400
+
+
+def test_parse_fields_valida_remove_repetidos_e_espacos():
+    assert parse_fields(None, RESPONSE_FIELDS) is None
+    assert parse_fields("", RESPONSE_FIELDS) is None
+    assert parse_fields(" id, name ,id,", RESPONSE_FIELDS) == ["id", "name"]
+
+
+@pytest.mark.parametrize("fields", ["password", "id,password", "name,flg_deleted"])
+def test_parse_fields_campo_desconhecido_responde_400(fields):
+    with pytest.raises(HTTPException) as error:
+        parse_fields(fields, RESPONSE_FIELDS)
+    assert error.value.status_code == 400
+    assert "fields" in error.value.detail
@@ -0,0 +1,34 @@
+import asyncio
+
+from api.utils.metrics import MetricsMiddleware, MetricsRegistry
+
+
+async def _app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 204, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def _call(middleware: MetricsMiddleware, method: str) -> None:
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": method, "path": "/qualquer", "headers": []}
+    asyncio.run(middleware(scope, receive, send))
+
+
+def test_metodos_desconhecidos_viram_other():
+    registry = MetricsRegistry()
+    middleware = MetricsMiddleware(_app, registry=registry)
+
+    for method in ("GET", "POST", "FOO", "BAR", "get"):
+        _call(middleware, method)
+
+    output = registry.render()
+    assert 'method="GET"' in output
+    assert 'method="POST"' in output
+    assert 'method="OTHER"' in output
+    assert "FOO" not in output and "BAR" not in output
+    assert 'http_requests_total{method="OTHER",route="unmatched",status="204"} 3' in output
@@ -0,0 +1,95 @@
+import base64
+from datetime import datetime, timezone
+import json
+from uuid import uuid4
+
+from fastapi import HTTPException
+import pytest
+
+from api.utils.pagination import decode_cursor, encode_cursor, next_cursor
+from api.v1._shared.models import User
+
+DEFAULT_SORT = [(User.created_at, True), (User.id, True)]
+NAME_SORT = [(User.name, False), (User.id, False)]
+
+
+def _raw_cursor(payload) -> str:
+    raw = json.dumps(payload).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _assert_bad_request(cursor: str, sort_columns=DEFAULT_SORT) -> HTTPException:
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, sort_columns)
+    assert error.value.status_code == 400
+    return error.value
+
+
+def test_cursor_ida_e_volta_preserva_os_tipos():
+    created_at = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    id = uuid4()
+
+    cursor = encode_cursor([created_at, id], DEFAULT_SORT)
+
+    assert decode_cursor(cursor, DEFAULT_SORT) == [created_at, id]
+
+
+def test_cursor_de_texto_ida_e_volta():
+    id = uuid4()
+    cursor = encode_cursor(["José da Silva", id], NAME_SORT)
+
+    assert decode_cursor(cursor, NAME_SORT) == ["José da Silva", id]
+
+
+def test_next_cursor_so_com_pagina_cheia():
+    rows = [{"name": "Ana", "id": uuid4()}, {"name": "Bia", "id": uuid4()}]
+
+    assert next_cursor(rows, limit=3, sort_columns=NAME_SORT) is None
+    cursor = next_cursor(rows, limit=2, sort_columns=NAME_SORT)
+    assert decode_cursor(cursor, NAME_SORT) == ["Bia", rows[-1]["id"]]
+
+
+@pytest.mark.parametrize("cursor", ["!!!", "bm90LWpzb24", _raw_cursor("texto"), _raw_cursor({"k": []})])
+def test_cursor_invalido_responde_400(cursor):
+    error = _assert_bad_request(cursor)
+    assert error.detail == "Cursor inválido"
+
+
+def test_cursor_adulterado_responde_400():
+    cursor = encode_cursor([datetime.now(timezone.utc), uuid4()], DEFAULT_SORT)
+    tampered = cursor[:-4] + ("AAAA" if not cursor.endswith("AAAA") else "BBBB")
+
+    _assert_bad_request(tampered)
+
+
+def test_cursor_de_outra_ordenacao_responde_400():
+    cursor = encode_cursor(["Ana", uuid4()], NAME_SORT)
+
+    error = _assert_bad_request(cursor, DEFAULT_SORT)
+    assert "ordenação" in error.detail
+
+
+@pytest.mark.parametrize("values", [
+    1,
+    {"a": 1},
+    [{"a": 1}, "id"],
+    [["lista"], "id"],
+    [None, "id"],
+])
+def test_chave_nao_escalar_responde_400(values):
+    cursor = _raw_cursor({"s": "name:asc,id:asc", "k": values})
+
+    error = _assert_bad_request(cursor, NAME_SORT)
+    assert error.detail == "Cursor inválido"
+
+
+@pytest.mark.parametrize("values", [
+    [123, str(uuid4())],
+    [True, str(uuid4())],
+    ["Ana", "nao-e-uuid"],
+    ["Ana\x00", str(uuid4())],
+])
+def test_valor_com_tipo_errado_para_a_coluna_responde_400(values):
+    cursor = _raw_cursor({"s": "name:asc,id:asc", "k": values})
+
+    _assert_bad_request(cursor, NAME_SORT)
@@ -0,0 +1,180 @@
+import asyncio
+import time
+
+from fastapi import HTTPException
+import pytest
+
+from api.utils.single_flight import SingleFlight
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_chamadas_simultaneas_compartilham_uma_execucao():
+    async def scenario():
+        flight = SingleFlight(timeout=1)
+        calls = 0
+        release = asyncio.Event()
+
+        async def func():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"ok": True}
+
+        tasks = [asyncio.create_task(flight.do("key", func)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+        return flight, calls, results
+
+    flight, calls, results = run(scenario())
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert flight.leaders == 1
+    assert flight.coalesced == 4
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_chaves_diferentes_nao_sao_coalescidas():
+    async def scenario():
+        flight = SingleFlight(timeout=1)
+
+        async def func(value):
+            await asyncio.sleep(0)
+            return value
+
+        return flight, await asyncio.gather(
+            flight.do("a", lambda: func("a")),
+            flight.do("b", lambda: func("b")),
+        )
+
+    flight, results = run(scenario())
+    assert results == ["a", "b"]
+    assert flight.leaders == 2
+    assert flight.coalesced == 0
+
+
+def test_excecao_do_lider_e_repassada_a_quem_aguardava():
+    async def scenario():
+        flight = SingleFlight(timeout=1)
+        release = asyncio.Event()
+
+        async def func():
+            await release.wait()
+            raise ValueError("falhou")
+
+        tasks = [asyncio.create_task(flight.do("key", func)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        return flight, await asyncio.gather(*tasks, return_exceptions=True)
+
+    flight, results = run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.errors == 1
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_nova_chamada_depois_do_erro_executa_de_novo():
+    async def scenario():
+        flight = SingleFlight(timeout=1)
+        calls = 0
+
+        async def func():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise ValueError("falhou")
+            return "ok"
+
+        with pytest.raises(ValueError):
+            await flight.do("key", func)
+        result = await flight.do("key", func)
+        return calls, result
+
+    calls, result = run(scenario())
+    assert calls == 2
+    assert result == "ok"
+
+
+def test_lider_cancelado_faz_quem_aguardava_assumir():
+    async def scenario():
+        flight = SingleFlight(timeout=1)
+        calls = 0
+        release = asyncio.Event()
+
+        async def func():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                # Primeiro líder fica parado até ser cancelado
+                await asyncio.Event().wait()
+            await release.wait()
+            return "novo líder"
+
+        leader = asyncio.create_task(flight.do("key", func))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", func))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        await asyncio.sleep(0)
+        release.set()
+        result = await follower
+        return flight, calls, result
+
+    flight, calls, result = run(scenario())
+    assert result == "novo líder"
+    assert calls == 2
+    assert flight.leaders == 2
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_timeout_aguardando_responde_503_sem_cancelar_o_lider():
+    async def scenario():
+        flight = SingleFlight(timeout=0.01)
+        release = asyncio.Event()
+
+        async def func():
+            await release.wait()
+            return "ok"
+
+        leader = asyncio.create_task(flight.do("key", func))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as error:
+            await flight.do("key", func)
+
+        release.set()
+        return flight, error.value, await leader
+
+    flight, error, result = run(scenario())
+    assert error.status_code == 503
+    assert error.headers == {"Retry-After": "1"}
+    assert result == "ok"
+    assert flight.timeouts == 1
+
+
+def test_consulta_sincrona_em_thread_e_coalescida():
+    # Modo DB_ASYNC=False: o use case roda a consulta bloqueante com asyncio.to_thread
+    async def scenario():
+        flight = SingleFlight(timeout=1)
+        calls = 0
+
+        def blocking_query():
+            nonlocal calls
+            calls += 1
+            time.sleep(0.05)
+            return "linhas"
+
+        results = await asyncio.gather(*[
+            flight.do("key", lambda: asyncio.to_thread(blocking_query)) for _ in range(5)
+        ])
+        return flight, calls, results
+
+    flight, calls, results = run(scenario())
+    assert calls == 1
+    assert results == ["linhas"] * 5
+    assert flight.coalesced == 4